@@ -0,0 +1,206 @@
+import argparse
+import json
+import mmap
+import os
+import zlib
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from BinarySnapshot import BinarySnapshot
+from LegacyMigration import readLegacyUsers
+
+
+# Upper edges of the remaining-balance buckets; the last bucket is open-ended
+REMAINING_BUCKETS = (-10000, -1000, -100, 0, 100, 1000, 10000)
+
+# saveData writes JSON with indent=4, so each user starts on a line with its email key indented 8 spaces,
+# the user's own fields are indented 12 and the users object closes with a brace indented 4. Raw newlines
+# never occur inside JSON strings, so these markers can be found without parsing anything else.
+USER_START = b'\n        "'
+USER_FIELD = b'\n            "'
+USERS_END = b'\n    }'
+INDENTED_PREFIX = b'{\n    "users": {'
+
+
+def emptyAggregate():
+    return {
+        'users': 0, 'totalIncome': 0.0, 'totalExpenses': 0.0,
+        'usersWithBudget': 0, 'overBudget': 0,
+        'remainingSum': 0.0, 'remainingMin': None, 'remainingMax': None,
+        'remainingBuckets': [0] * (len(REMAINING_BUCKETS) + 1),
+    }
+
+
+def userTotals(user):
+    # Files written before running totals existed only have the entries
+    totals = user.get('totals')
+    if totals is not None:
+        return totals['income'], totals['expenses']
+    return (sum(entry['amount'] for entry in user.get('income', [])),
+            sum(entry['amount'] for entry in user.get('expenses', [])))
+
+
+def addUser(aggregate, user):
+    income, expenses = userTotals(user)
+    aggregate['users'] += 1
+    aggregate['totalIncome'] += income
+    aggregate['totalExpenses'] += expenses
+    budget = user.get('budget') or 0
+    if budget <= 0:
+        return
+    # Remaining is budget minus expenses, as in viewReport; users without a budget have none
+    remaining = budget - expenses
+    aggregate['usersWithBudget'] += 1
+    aggregate['overBudget'] += remaining < 0
+    aggregate['remainingSum'] += remaining
+    aggregate['remainingMin'] = remaining if aggregate['remainingMin'] is None else min(aggregate['remainingMin'], remaining)
+    aggregate['remainingMax'] = remaining if aggregate['remainingMax'] is None else max(aggregate['remainingMax'], remaining)
+    aggregate['remainingBuckets'][bisect_right(REMAINING_BUCKETS, remaining)] += 1
+
+
+def mergeAggregates(target, aggregate):
+    for field in ('users', 'totalIncome', 'totalExpenses', 'usersWithBudget', 'overBudget', 'remainingSum'):
+        target[field] += aggregate[field]
+    for field, pick in (('remainingMin', min), ('remainingMax', max)):
+        if aggregate[field] is not None:
+            target[field] = aggregate[field] if target[field] is None else pick(target[field], aggregate[field])
+    target['remainingBuckets'] = [a + b for a, b in zip(target['remainingBuckets'], aggregate['remainingBuckets'])]
+
+
+def fieldValue(buffer, name, start, end):
+    """Decodes just one top-level field of the user whose text is buffer[start:end], or returns None if absent."""
+    at = buffer.find(USER_FIELD + name.encode() + b'":', start, end)
+    if at < 0:
+        return None
+    valueStart = buffer.find(b':', at + len(USER_FIELD)) + 1
+    valueEnd = buffer.find(USER_FIELD, valueStart, end)
+    if valueEnd < 0:
+        valueEnd = buffer.rfind(b'}', valueStart, end)  # The last field; stop before the user's closing brace
+    return json.loads(buffer[valueStart:valueEnd].rstrip().rstrip(b','))
+
+
+def aggregateRange(fileName, start, end):
+    """
+    Worker: aggregates the users whose key line starts in bytes start..end of an indented JSON data file.
+    The file is memory-mapped and only each user's budget and totals are decoded, so the entries
+    are never parsed and a worker holds no more than one small value at a time.
+    """
+    aggregate = emptyAggregate()
+    with open(fileName, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        # A user belongs to the range its key line starts in; the match includes the newline before it
+        userStart = buffer.find(USER_START, max(0, start - 1), end + len(USER_START))
+        while 0 <= userStart and userStart + 1 < end:
+            nextStart = buffer.find(USER_START, userStart + 1)
+            # The last user ends where the users object closes; searching no further than the user keeps
+            # every worker's scanning to its own range
+            usersEnd = buffer.find(USERS_END, userStart, nextStart if nextStart >= 0 else len(buffer))
+            userEnd = usersEnd if usersEnd >= 0 else nextStart
+            totals = fieldValue(buffer, 'totals', userStart, userEnd)
+            if totals is None:
+                # Written before running totals existed; decode the whole user to add up the entries
+                text = buffer[userStart:userEnd].rstrip().rstrip(b',')
+                user = next(iter(json.loads(b'{' + text + b'}').values()))
+            else:
+                user = {'budget': fieldValue(buffer, 'budget', userStart, userEnd), 'totals': totals}
+            addUser(aggregate, user)
+            userStart = -1 if usersEnd >= 0 else nextStart
+    return aggregate
+
+
+def binaryAggregate(fileName):
+    """Aggregates a binary snapshot from its leading profile/budget/totals section; the columns are never read."""
+    with open(fileName, 'rb') as file:
+        flags = BinarySnapshot.readHeader(file.read(BinarySnapshot.HEADER.size))
+        decompressor = zlib.decompressobj() if flags & BinarySnapshot.COMPRESSED else None
+        body = b''
+        needed = BinarySnapshot.LENGTH.size
+        while len(body) < needed:
+            chunk = file.read(1 << 20)
+            if not chunk:
+                raise ValueError("Snapshot is truncated.")
+            body += decompressor.decompress(chunk) if decompressor else chunk
+            if needed == BinarySnapshot.LENGTH.size and len(body) >= needed:
+                needed += BinarySnapshot.LENGTH.unpack_from(body, 0)[0]
+    metaBytes, _ = BinarySnapshot.readSection(body, 0)
+    aggregate = emptyAggregate()
+    for user in json.loads(metaBytes)['users'].values():
+        addUser(aggregate, user)
+    return aggregate
+
+
+def populationReport(fileName='NewfinanceData.json', workers=None):
+    """
+    Population-wide totals, budget overruns and the distribution of remaining budget across every user in
+    fileName, read from disk without loading it into a tracker.
+
+    Indented JSON files are split into byte ranges that a process pool aggregates independently; the
+    partial aggregates are then merged. Binary snapshots only need their small leading section, and any
+    other JSON is streamed user by user in this process.
+    """
+    with open(fileName, 'rb') as file:
+        prefix = file.read(len(INDENTED_PREFIX))
+    if BinarySnapshot.isBinary(prefix):
+        return finishReport(binaryAggregate(fileName))
+    if prefix != INDENTED_PREFIX:
+        aggregate = emptyAggregate()
+        # The migration reader streams any file with a top-level "users" object
+        for _, user, _ in readLegacyUsers(fileName):
+            addUser(aggregate, user)
+        return finishReport(aggregate)
+
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(fileName)
+    # A few ranges per worker evens out users of very different sizes
+    partitions = max(1, min(workers * 4, size // (1 << 20)))
+    bounds = [size * index // partitions for index in range(partitions + 1)]
+    aggregate = emptyAggregate()
+    if partitions == 1:
+        mergeAggregates(aggregate, aggregateRange(fileName, 0, size))
+        return finishReport(aggregate)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(aggregateRange, fileName, start, end) for start, end in zip(bounds, bounds[1:])]
+        for future in as_completed(futures):
+            mergeAggregates(aggregate, future.result())
+    return finishReport(aggregate)
+
+
+def finishReport(aggregate):
+    withBudget = aggregate['usersWithBudget']
+    labels = [f"< {REMAINING_BUCKETS[0]}"]
+    labels += [f"{low} to {high}" for low, high in zip(REMAINING_BUCKETS, REMAINING_BUCKETS[1:])]
+    labels.append(f">= {REMAINING_BUCKETS[-1]}")
+    return {
+        "Users": aggregate['users'],
+        "Total Income": aggregate['totalIncome'],
+        "Total Expenses": aggregate['totalExpenses'],
+        "Net": aggregate['totalIncome'] - aggregate['totalExpenses'],
+        "Users With Budget": withBudget,
+        "Over Budget": aggregate['overBudget'],
+        "Mean Remaining": aggregate['remainingSum'] / withBudget if withBudget else 0.0,
+        "Lowest Remaining": aggregate['remainingMin'] or 0.0,
+        "Highest Remaining": aggregate['remainingMax'] or 0.0,
+        "Remaining Distribution": dict(zip(labels, aggregate['remainingBuckets'])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate totals and budget standing across every user of a data file")
+    parser.add_argument("fileName", nargs="?", default="NewfinanceData.json")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    report = populationReport(args.fileName, args.workers)
+    print(f"\n--- Population Report ({args.fileName}) ---")
+    for key, value in report.items():
+        if isinstance(value, dict):
+            print(f"{key}:")
+            for bucket, count in value.items():
+                print(f"  {bucket}: {count}")
+        elif isinstance(value, float):
+            print(f"{key}: ${value:,.2f}")
+        else:
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class Analytics:
+    """
+    Spending analytics computed with NumPy over contiguous amount arrays and integer name codes.
+
+    Grouping is a bincount over the codes, so the cost is a few vectorized passes no matter how many
+    entries a user has; no per-entry Python dicts are built.
+    """
+
+    @staticmethod
+    def columnArrays(columns):
+        # Zero-copy views over a TransactionColumns' array('d') amounts and array('I') codes
+        amounts = np.frombuffer(columns.amounts, dtype=np.float64) if len(columns) else np.empty(0)
+        codes = np.frombuffer(columns.codes, dtype=np.uintc) if len(columns) else np.empty(0, dtype=np.uintc)
+        return amounts, codes
+
+    @staticmethod
+    def groupTotals(amounts, codes, names):
+        """Returns {name: total}, largest first, for amounts grouped by code into names."""
+        if amounts.size == 0:
+            return {}
+        totals = np.bincount(codes, weights=amounts, minlength=len(names))
+        present = np.flatnonzero(np.bincount(codes, minlength=len(names)))
+        order = present[np.argsort(-totals[present], kind='stable')]
+        return {names[code]: float(totals[code]) for code in order}
+
+    @staticmethod
+    def summaryArrays(columns):
+        """(positions, entry counts) of the summary entries history compaction left in a TransactionColumns."""
+        summaries = columns.summaries()
+        return (np.fromiter((position for position, _ in summaries), dtype=np.intp, count=len(summaries)),
+                np.fromiter((count for _, count in summaries), dtype=np.int64, count=len(summaries)))
+
+    @staticmethod
+    def describe(amounts, summaries=None):
+        """
+        Count, total, mean, median, 90th percentile and maximum of the amounts. summaries, from summaryArrays,
+        marks compacted entries: they count as the entries they replaced in count and mean, but the median,
+        percentile and maximum use only the entries that are still held individually.
+        """
+        count = amounts.size
+        individual = amounts
+        if summaries is not None and summaries[0].size:
+            positions, counts = summaries
+            count += int(counts.sum()) - positions.size
+            individual = np.delete(amounts, positions)
+        if count == 0:
+            return {"count": 0, "total": 0.0, "mean": 0.0, "median": 0.0, "p90": 0.0, "max": 0.0}
+        median, p90 = np.percentile(individual, [50, 90]) if individual.size else (0.0, 0.0)
+        return {
+            "count": int(count),
+            "total": float(amounts.sum()),
+            "mean": float(amounts.sum() / count),
+            "median": float(median),
+            "p90": float(p90),
+            "max": float(individual.max()) if individual.size else 0.0,
+        }
+
+    @staticmethod
+    def summarize(expenseAmounts, expenseCodes, expenseNames, incomeAmounts, incomeCodes, incomeNames, topN=5,
+                  expenseSummaries=None, incomeSummaries=None):
+        expenses = Analytics.describe(expenseAmounts, expenseSummaries)
+        income = Analytics.describe(incomeAmounts, incomeSummaries)
+        byCategory = Analytics.groupTotals(expenseAmounts, expenseCodes, expenseNames)
+        return {
+            "Total Expenses": expenses['total'],
+            "Expense Count": expenses['count'],
+            "Mean Expense": expenses['mean'],
+            "Median Expense": expenses['median'],
+            "90th Percentile Expense": expenses['p90'],
+            "Largest Expense": expenses['max'],
+            "Total Income": income['total'],
+            "Income Count": income['count'],
+            "Mean Income": income['mean'],
+            "Median Income": income['median'],
+            f"Top {topN} Categories": dict(list(byCategory.items())[:topN]),
+            "Expenses by Category": byCategory,
+            "Income by Source": Analytics.groupTotals(incomeAmounts, incomeCodes, incomeNames),
+        }
+
+    @staticmethod
+    def fromRows(rows):
+        """Builds (amounts, codes, names) from (name, amount) rows, for backends without columnar storage."""
+        codesByName = {}
+        amounts = []
+        codes = []
+        for name, amount in rows:
+            codes.append(codesByName.setdefault(name, len(codesByName)))
+            amounts.append(amount)
+        return np.asarray(amounts, dtype=np.float64), np.asarray(codes, dtype=np.uintc), list(codesByName)
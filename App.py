@@ -1,15 +1,89 @@
 # main.py
+import argparse
+import contextlib
+import sys
 from FinanceTracker import FinanceTracker
 from FinanceTrackerApp import FinanceTrackerApp
+from SQLiteFinanceTracker import SQLiteFinanceTracker
+from ShardedFinanceTracker import ShardedFinanceTracker
+from PasswordHasher import PasswordHasher
+from RateLimiter import RateLimiter
+from Instrumentation import Metrics, MetricsDumper, instrumented
+from BatchRunner import runBatchFile
+from BudgetAlerts import FileNotifier
 
 
 def main():
-    # Instantiate FinanceTracker
-    tracker = FinanceTracker()
+    parser = argparse.ArgumentParser(description="Personal Finance Tracker")
+    parser.add_argument("--storage", choices=["json", "sqlite", "sharded"], default="json",
+                        help="storage backend for the tracker (default: json)")
+    parser.add_argument("--file", help="data file (or directory for sharded storage) instead of the backend's default")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12,
+                        help="bcrypt work factor; existing hashes are upgraded on login (default: 12)")
+    parser.add_argument("--hash-workers", type=int, help="size of the password hashing pool (default: CPU count)")
+    parser.add_argument("--journaled", action="store_true",
+                        help="json storage: append each change to a journal and checkpoint periodically")
+    parser.add_argument("--write-behind", action="store_true",
+                        help="json storage: save in the background instead of on every change")
+    parser.add_argument("--shared", action="store_true",
+                        help="json storage: lock and merge so several processes can use the same data file")
+    parser.add_argument("--snapshot-format", choices=["json", "binary", "binary+zlib"],
+                        help="json storage: format to save in (default: keep the file's current format)")
+    parser.add_argument("--rate-limit-snapshot", metavar="FILE",
+                        help="keep failed-login throttling across restarts by snapshotting it to FILE")
+    parser.add_argument("--alerts-file", metavar="FILE",
+                        help="json/sharded storage: append budget threshold alerts to FILE as JSON lines")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run commands from FILE ('-' for stdin) instead of the menu and print JSONL results")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="record per-operation timings and counters and dump them to FILE periodically")
+    parser.add_argument("--metrics-interval", type=int, default=10000,
+                        help="milliseconds between metrics dumps (default: 10000)")
+    args = parser.parse_args()
+
+    passwordHasher = PasswordHasher(rounds=args.bcrypt_rounds, workers=args.hash_workers)
+    rateLimiter = RateLimiter(snapshotFile=args.rate_limit_snapshot)
+    alertNotifier = FileNotifier(args.alerts_file) if args.alerts_file else None
+
+    # Pick the tracker class for the chosen backend
+    if args.storage == "sqlite":
+        trackerClass, options = SQLiteFinanceTracker, {}
+    elif args.storage == "sharded":
+        trackerClass, options = ShardedFinanceTracker, {'alertNotifier': alertNotifier}
+    else:
+        trackerClass, options = FinanceTracker, {'journaled': args.journaled, 'writeBehind': args.write_behind,
+                                                 'snapshotFormat': args.snapshot_format, 'shared': args.shared,
+                                                 'alertNotifier': alertNotifier}
+    defaultFile = {"sqlite": 'financeData.db', "sharded": 'financeData'}.get(args.storage, 'NewfinanceData.json')
+
+    dumper = None
+    if args.metrics:
+        # Instrument before constructing, so the initial loadData is measured too
+        trackerClass = instrumented(trackerClass, Metrics())
+        dumper = MetricsDumper(trackerClass.metrics, args.metrics, args.metrics_interval)
+    # In batch mode stdout carries only JSONL results, so load-time notices go to stderr
+    with contextlib.redirect_stdout(sys.stderr) if args.batch else contextlib.nullcontext():
+        tracker = trackerClass(args.file or defaultFile, passwordHasher=passwordHasher, rateLimiter=rateLimiter,
+                               **options)
+
+    if args.batch:
+        try:
+            summary = runBatchFile(tracker, args.batch)
+        finally:
+            with contextlib.redirect_stdout(sys.stderr):
+                tracker.close()
+            if dumper:
+                dumper.close()
+        print(f"✅ Ran {summary['commands']} commands, {summary['failed']} failed.", file=sys.stderr)
+        sys.exit(1 if summary['failed'] else 0)
 
     # Instantiate the app and pass the tracker
     app = FinanceTrackerApp(tracker)
-    app.run()
+    try:
+        app.run()
+    finally:
+        if dumper:
+            dumper.close()
 
 if __name__ == "__main__":
     main()
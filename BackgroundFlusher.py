@@ -0,0 +1,69 @@
+import atexit
+import threading
+import time
+
+
+class BackgroundFlusher:
+    """
+    Write-behind persistence: callers mark the data dirty and a background thread calls flushFunction
+    at most once per intervalMs, or sooner once maxPending changes have piled up.
+    flush() writes immediately and close() stops the thread after a final flush.
+    """
+
+    def __init__(self, flushFunction, intervalMs=500, maxPending=100):
+        self.flushFunction = flushFunction
+        self.interval = intervalMs / 1000
+        self.maxPending = maxPending
+        self.pending = 0
+        self.firstDirtyAt = None
+        self.closed = False
+        self.condition = threading.Condition()
+        self.flushLock = threading.Lock()  # Keeps flushes in order so an older snapshot never replaces a newer one
+        self.thread = threading.Thread(target=self.run, name="BackgroundFlusher", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def markDirty(self):
+        with self.condition:
+            self.pending += 1
+            if self.firstDirtyAt is None:
+                self.firstDirtyAt = time.monotonic()
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.closed and self.pending == 0:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                deadline = self.firstDirtyAt + self.interval
+                while not self.closed and self.pending < self.maxPending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        with self.flushLock:
+            with self.condition:
+                self.pending = 0
+                self.firstDirtyAt = None
+            try:
+                self.flushFunction()
+            except Exception as e:
+                print(f"❌ Background save failed: {e}")
+
+    def close(self):
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+        if self.pending:
+            self.flush()
+        atexit.unregister(self.close)
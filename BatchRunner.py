@@ -0,0 +1,133 @@
+import contextlib
+import json
+import math
+import shlex
+import sys
+from datetime import datetime
+
+from IFinanceTracker import IFinanceTracker
+
+
+# Command -> argument names in line-grammar order; names in OPTIONAL_FIELDS may be left off the end
+COMMANDS = {
+    'login': ('identifier', 'password'),
+    'logout': (),
+    'add-expense': ('category', 'amount', 'date'),
+    'add-income': ('source', 'amount', 'date'),
+    'set-budget': ('amount',),
+    'report': ('period',),
+}
+OPTIONAL_FIELDS = ('date', 'period')
+
+
+def parseCommand(line):
+    """
+    Parses one batch line into a request dict, or returns None for blank lines and # comments.
+    A line is either a JSON object such as {"command": "add-expense", "category": "rent", "amount": 900}
+    or the same command in shell-like words: add-expense rent 900 2024-05-01. Raises ValueError if invalid.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('{'):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e.msg}")
+        if not isinstance(request, dict):
+            raise ValueError("a JSON command must be an object")
+    else:
+        words = shlex.split(line)
+        command, arguments = words[0], words[1:]
+        fields = COMMANDS.get(command)
+        if fields is None:
+            raise ValueError(f"unknown command {command!r}")
+        if len(arguments) > len(fields):
+            raise ValueError(f"{command} takes at most {len(fields)} arguments: {' '.join(fields)}")
+        request = dict(zip(fields, arguments), command=command)
+    command = request.get('command')
+    if command not in COMMANDS:
+        raise ValueError(f"unknown command {command!r}; expected one of {', '.join(COMMANDS)}")
+    missing = [field for field in COMMANDS[command] if field not in OPTIONAL_FIELDS and request.get(field) in (None, '')]
+    if missing:
+        raise ValueError(f"{command} needs {', '.join(missing)}")
+    return request
+
+
+def parseAmount(request):
+    try:
+        amount = float(request['amount'])
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid amount {request.get('amount')!r}")
+    # float() also accepts nan and inf, which would poison the totals and are not valid JSON in the results
+    if not math.isfinite(amount):
+        raise ValueError(f"invalid amount {request.get('amount')!r}")
+    return amount
+
+
+def parseDate(request):
+    if not request.get('date'):
+        return None
+    try:
+        return datetime.fromisoformat(str(request['date']))
+    except ValueError:
+        raise ValueError(f"invalid date {request['date']!r}, expected YYYY-MM-DD")
+
+
+def executeCommand(tracker: IFinanceTracker, request):
+    """Runs one parsed request and returns its result as {'ok', 'message'} plus 'report' for reports."""
+    command = request['command']
+    if command == 'login':
+        message = tracker.login(str(request['identifier']), str(request['password']))
+    elif command == 'logout':
+        message = tracker.logout()
+    elif command == 'add-expense':
+        message = tracker.addExpense(str(request['category']), parseAmount(request), timestamp=parseDate(request))
+    elif command == 'add-income':
+        message = tracker.addIncome(str(request['source']), parseAmount(request), timestamp=parseDate(request))
+    elif command == 'set-budget':
+        message = tracker.setBudget(parseAmount(request))
+    else:
+        period = request.get('period')
+        report = tracker.viewPeriodReport(period) if period else tracker.viewReport()
+        if report is None:
+            return {'ok': False, 'message': "❌ Could not generate the report."}
+        return {'ok': True, 'message': "✅ Report generated.", 'report': report}
+    return {'ok': message.startswith("✅"), 'message': message}
+
+
+def runBatch(tracker: IFinanceTracker, lines, output):
+    """
+    Executes batch lines in order and writes one JSON result per command to output.
+    Trackers that support batch() save once at the end instead of after every change.
+    Returns {'commands': int, 'failed': int}.
+    """
+    summary = {'commands': 0, 'failed': 0}
+    batch = tracker.batch() if hasattr(tracker, 'batch') else contextlib.nullcontext()
+    with batch:
+        for lineNumber, line in enumerate(lines, start=1):
+            try:
+                request = parseCommand(line)
+            except ValueError as e:
+                request, result = None, {'ok': False, 'message': f"❌ {e}"}
+            else:
+                if request is None:
+                    continue
+                try:
+                    result = executeCommand(tracker, request)
+                except ValueError as e:
+                    result = {'ok': False, 'message': f"❌ {e}"}
+            summary['commands'] += 1
+            summary['failed'] += not result['ok']
+            result = dict(line=lineNumber, command=request and request['command'], **result)
+            output.write(json.dumps(result) + "\n")
+    return summary
+
+
+def runBatchFile(tracker: IFinanceTracker, fileName, output=None):
+    """Runs a batch file ('-' for stdin). Status messages the tracker prints go to stderr to keep the output pure JSONL."""
+    output = output or sys.stdout
+    with contextlib.ExitStack() as stack:
+        lines = sys.stdin if fileName == '-' else stack.enter_context(open(fileName, 'r'))
+        stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        return runBatch(tracker, lines, output)
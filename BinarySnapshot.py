@@ -0,0 +1,200 @@
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from TransactionStore import TransactionColumns
+
+
+class BinarySnapshot:
+    """
+    Length-prefixed binary layout for the tracker's data, as an alternative to the JSON snapshot.
+
+    Layout (little-endian):
+        MAGIC (7 bytes), version (u8), flags (u32, bit 0 = body is zlib-compressed), reserved (u32), then
+        the body: u64 length + JSON of everything except the transaction columns (profiles, budget, totals),
+        u64 length + JSON list of the string table, then for each user in the order of the JSON section:
+        expenses and income, each as u64 entry count, u64 extras length, amounts (f64 each),
+        timestamps (f64 each), name codes (u32 each), padding, extras JSON, padding.
+
+    Every section starts 8-byte aligned, so in an uncompressed file the amount arrays can be mapped with
+    mmap and read in place (see mapAmounts) without decoding the rest of the file.
+    """
+
+    MAGIC = b'FTSNAP\x00'
+    VERSION = 1
+    COMPRESSED = 0x1
+    HEADER = struct.Struct('<7sBII')
+    LENGTH = struct.Struct('<Q')
+    COLUMN = struct.Struct('<QQ')
+    KINDS = (('expenses', 'category'), ('income', 'source'))
+
+    @staticmethod
+    def isBinary(prefix):
+        return prefix[:len(BinarySnapshot.MAGIC)] == BinarySnapshot.MAGIC
+
+    @staticmethod
+    def padding(length):
+        return b'\x00' * (-length % 8)
+
+    @staticmethod
+    def nativeBytes(values):
+        # Arrays are stored little-endian; only big-endian machines pay for a swap
+        if sys.byteorder != 'little':
+            values = array(values.typecode, values)
+            values.byteswap()
+        return values.tobytes()
+
+    @staticmethod
+    def lengthPrefixed(payload):
+        return [BinarySnapshot.LENGTH.pack(len(payload)), payload, BinarySnapshot.padding(len(payload))]
+
+    @staticmethod
+    def dumps(data, stringTable, compress=False):
+        """Encodes tracker data whose users hold TransactionColumns built on stringTable."""
+        meta = dict(data)
+        meta['users'] = {email: {field: value for field, value in user.items()
+                                 if field not in ('expenses', 'income', 'rollups')}
+                         for email, user in data['users'].items()}  # Rollups are rebuilt from the entries
+        parts = BinarySnapshot.lengthPrefixed(json.dumps(meta, separators=(',', ':')).encode())
+        parts += BinarySnapshot.lengthPrefixed(json.dumps(stringTable.strings, separators=(',', ':')).encode())
+        for user in data['users'].values():
+            for kind, _ in BinarySnapshot.KINDS:
+                columns = user[kind]
+                extras = json.dumps(columns.extras, separators=(',', ':')).encode() if columns.extras else b''
+                codes = BinarySnapshot.nativeBytes(columns.codes)
+                parts += [BinarySnapshot.COLUMN.pack(len(columns), len(extras)),
+                          BinarySnapshot.nativeBytes(columns.amounts), BinarySnapshot.nativeBytes(columns.timestamps),
+                          codes, BinarySnapshot.padding(len(codes)), extras, BinarySnapshot.padding(len(extras))]
+        body = b''.join(parts)
+        flags = 0
+        if compress:
+            body = zlib.compress(body, 6)
+            flags |= BinarySnapshot.COMPRESSED
+        return BinarySnapshot.HEADER.pack(BinarySnapshot.MAGIC, BinarySnapshot.VERSION, flags, 0) + body
+
+    @staticmethod
+    def readHeader(buffer):
+        """Returns the header flags. Raises ValueError if buffer is not a snapshot this code can read."""
+        if len(buffer) < BinarySnapshot.HEADER.size:
+            raise ValueError("Snapshot is truncated.")
+        magic, version, flags, _ = BinarySnapshot.HEADER.unpack_from(buffer, 0)
+        if magic != BinarySnapshot.MAGIC:
+            raise ValueError("Not a binary finance snapshot.")
+        if version != BinarySnapshot.VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        return flags
+
+    @staticmethod
+    def readArray(typecode, body, offset, count):
+        values = array(typecode)
+        end = offset + count * values.itemsize
+        if end > len(body):
+            raise ValueError("Snapshot is truncated.")
+        values.frombytes(body[offset:end])
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values, end
+
+    @staticmethod
+    def readSection(body, offset):
+        if offset + BinarySnapshot.LENGTH.size > len(body):
+            raise ValueError("Snapshot is truncated.")
+        (length,) = BinarySnapshot.LENGTH.unpack_from(body, offset)
+        start = offset + BinarySnapshot.LENGTH.size
+        if start + length > len(body):
+            raise ValueError("Snapshot is truncated.")
+        return bytes(body[start:start + length]), start + length + (-length % 8)
+
+    @staticmethod
+    def loads(buffer, stringTable):
+        """
+        Decodes a snapshot into the tracker's data layout, with TransactionColumns built on stringTable,
+        which must be empty so the stored codes keep their meaning. Raises ValueError if it is damaged.
+        """
+        flags = BinarySnapshot.readHeader(buffer)
+        body = memoryview(buffer)[BinarySnapshot.HEADER.size:]
+        if flags & BinarySnapshot.COMPRESSED:
+            try:
+                body = memoryview(zlib.decompress(body))
+            except zlib.error as e:
+                raise ValueError(f"Snapshot body cannot be decompressed: {e}")
+        metaBytes, offset = BinarySnapshot.readSection(body, 0)
+        stringBytes, offset = BinarySnapshot.readSection(body, offset)
+        data = json.loads(metaBytes)
+        for string in json.loads(stringBytes):
+            stringTable.intern(string)
+        for user in data['users'].values():
+            for kind, keyName in BinarySnapshot.KINDS:
+                if offset + BinarySnapshot.COLUMN.size > len(body):
+                    raise ValueError("Snapshot is truncated.")
+                count, extrasLength = BinarySnapshot.COLUMN.unpack_from(body, offset)
+                offset += BinarySnapshot.COLUMN.size
+                columns = TransactionColumns(keyName, stringTable)
+                columns.amounts, offset = BinarySnapshot.readArray('d', body, offset, count)
+                columns.timestamps, offset = BinarySnapshot.readArray('d', body, offset, count)
+                columns.codes, offset = BinarySnapshot.readArray('I', body, offset, count)
+                offset += -offset % 8
+                if extrasLength:
+                    extras = json.loads(bytes(body[offset:offset + extrasLength]))
+                    columns.extras = {int(index): extra for index, extra in extras.items()}
+                offset += extrasLength + (-extrasLength % 8)
+                if columns.codes and max(columns.codes) >= len(stringTable):
+                    raise ValueError("Snapshot refers to an unknown category/source.")
+                user[kind] = columns
+        return data
+
+    @staticmethod
+    def mapAmounts(fileName):
+        """
+        Maps an uncompressed snapshot and returns (mapping, {email: {'expenses': view, 'income': view}})
+        where each view is a memoryview of float64 amounts read in place from the file.
+        Only the JSON section is decoded. Release the views before calling mapping.close().
+        """
+        with open(fileName, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if BinarySnapshot.readHeader(mapping) & BinarySnapshot.COMPRESSED:
+                raise ValueError("Compressed snapshots cannot be mapped; convert without compression first.")
+            if sys.byteorder != 'little':
+                raise ValueError("Mapped amounts are little-endian and cannot be read in place on this machine.")
+            body = memoryview(mapping)[BinarySnapshot.HEADER.size:]
+            metaBytes, offset = BinarySnapshot.readSection(body, 0)
+            _, offset = BinarySnapshot.readSection(body, offset)
+            views = {}
+            for email in json.loads(metaBytes)['users']:
+                views[email] = {}
+                for kind, _ in BinarySnapshot.KINDS:
+                    count, extrasLength = BinarySnapshot.COLUMN.unpack_from(body, offset)
+                    offset += BinarySnapshot.COLUMN.size
+                    views[email][kind] = body[offset:offset + count * 8].cast('d')
+                    offset += count * 20
+                    offset += -offset % 8
+                    offset += extrasLength + (-extrasLength % 8)
+            body.release()
+        except BaseException:
+            mapping.close()
+            raise
+        return mapping, views
+
+
+def convertSnapshot(sourceFileName='NewfinanceData.json', targetFileName='NewfinanceData.snap', snapshotFormat='binary'):
+    """Rewrites a tracker data file as 'json', 'binary' or 'binary+zlib'; the source format is detected."""
+    from FinanceTracker import FinanceTracker
+
+    with open(sourceFileName, 'rb'):
+        pass  # Fail here rather than let the tracker initialize an empty file
+    tracker = FinanceTracker(sourceFileName)
+    tracker.fileName = targetFileName
+    tracker.snapshotFormat = snapshotFormat
+    tracker.saveData()
+    users = len(tracker.data['users'])
+    tracker.close()
+    print(f"✅ Wrote {users} users from {sourceFileName} to {targetFileName} as {snapshotFormat}.")
+
+
+if __name__ == "__main__":
+    # Usage: python BinarySnapshot.py [source] [target] [json|binary|binary+zlib]
+    convertSnapshot(*sys.argv[1:4])
@@ -0,0 +1,103 @@
+import atexit
+import json
+import queue
+import threading
+
+
+class BudgetAlerts:
+    """
+    Budget threshold checks against a user's running totals.
+
+    Thresholds are percentages of the overall budget, and of a category's budget where one is set.
+    An expense crosses a threshold when spending was below it before the expense and is at or above it
+    after, so each climb past a line is reported once and no past entries are ever looked at.
+    """
+
+    DEFAULT_THRESHOLDS = (50, 80, 100)
+
+    @staticmethod
+    def spending(userData, category):
+        """Returns (total spent, spent in category) from the running totals."""
+        totals = userData['totals']
+        return totals['expenses'], totals['byCategory'].get(category, 0)
+
+    @staticmethod
+    def crossed(thresholds, budget, before, after):
+        if not budget or budget <= 0:
+            return []
+        return [threshold for threshold in thresholds if before < budget * threshold / 100 <= after]
+
+    @staticmethod
+    def check(userData, category, spentBefore):
+        """Returns the alerts an expense in category triggered, given spending() taken just before it was added."""
+        thresholds = userData.get('alertThresholds', BudgetAlerts.DEFAULT_THRESHOLDS)
+        spentAfter = BudgetAlerts.spending(userData, category)
+        alerts = []
+        budget = userData.get('budget', 0)
+        for threshold in BudgetAlerts.crossed(thresholds, budget, spentBefore[0], spentAfter[0]):
+            alerts.append({'category': None, 'threshold': threshold, 'spent': spentAfter[0], 'budget': budget})
+        categoryBudget = userData.get('categoryBudgets', {}).get(category)
+        for threshold in BudgetAlerts.crossed(thresholds, categoryBudget, spentBefore[1], spentAfter[1]):
+            alerts.append({'category': category, 'threshold': threshold, 'spent': spentAfter[1],
+                           'budget': categoryBudget})
+        return alerts
+
+    @staticmethod
+    def message(alert):
+        budgetName = f"your {alert['category']} budget" if alert['category'] else "your budget"
+        return (f"⚠️ You have used {alert['threshold']:g}% of {budgetName} "
+                f"(${alert['spent']:.2f} of ${alert['budget']:.2f}).")
+
+
+class QueueNotifier:
+    """Puts each alert on a queue.Queue for the application to consume."""
+
+    def __init__(self, alertQueue=None):
+        self.queue = alertQueue if alertQueue is not None else queue.Queue()
+
+    def notify(self, alert):
+        self.queue.put(alert)
+
+    def close(self):
+        pass
+
+
+class FileNotifier:
+    """
+    Appends each alert as a JSON line to fileName. Alerts are queued and written by a background thread,
+    so adding an expense never waits on the disk; close() writes whatever is still queued.
+    """
+
+    def __init__(self, fileName):
+        self.fileName = fileName
+        self.queue = queue.SimpleQueue()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name="FileNotifier", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def notify(self, alert):
+        self.queue.put(alert)
+
+    def run(self):
+        while True:
+            alerts = [self.queue.get()]
+            while not self.queue.empty():
+                alerts.append(self.queue.get())
+            stop = None in alerts
+            lines = [json.dumps(alert) + "\n" for alert in alerts if alert is not None]
+            try:
+                with open(self.fileName, 'a') as file:
+                    file.writelines(lines)
+            except OSError as e:
+                print(f"❌ Could not write budget alerts to {self.fileName}: {e}")
+            if stop:
+                return
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+        atexit.unregister(self.close)
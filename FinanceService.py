@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import json
+import math
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+from ErrorMessages import ErrorMessages
+from FinanceTracker import FinanceTracker
+from PasswordHasher import PasswordHasher
+from RateLimiter import RateLimiter
+
+
+class FinanceService:
+    """
+    Serves a FinanceTracker to many concurrent clients over a JSON line protocol.
+
+    Each request is one JSON object per line, e.g. {"command": "login", "identifier": "abu", "password": "..."},
+    and gets one JSON line back with "ok" and "message" (plus "token" or "report" where relevant).
+    Sessions are tokens held in memory per connection, so logging in never writes currentUser to disk.
+    Tracker calls run on a single storage thread, which keeps them serialized, and bcrypt runs on the
+    tracker's PasswordHasher pool, so neither blocks the event loop.
+    """
+
+    def __init__(self, tracker: FinanceTracker):
+        self.tracker = tracker
+        self.hasher = tracker.passwordHasher
+        self.storageExecutor = ThreadPoolExecutor(max_workers=1)
+        self.sessions = {}  # token -> email
+
+    async def runStorage(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.storageExecutor, lambda: function(*args, **kwargs))
+
+    async def handleClient(self, reader, writer):
+        connectionTokens = set()
+        peer = writer.get_extra_info('peername')
+        source = peer[0] if isinstance(peer, tuple) else None  # Client address, for login rate limiting
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = None
+                try:
+                    request = json.loads(line)
+                    response = await self.dispatch(request, connectionTokens, source)
+                except json.JSONDecodeError:
+                    response = {'ok': False, 'message': "❌ Request must be a single JSON object per line."}
+                except Exception as e:
+                    response = {'ok': False, 'message': f"{ErrorMessages.getMessage('unexpectedError')}: {e}"}
+                if isinstance(request, dict) and 'id' in request:
+                    response['id'] = request['id']
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # Tokens only live as long as the connection that created them
+            for token in connectionTokens:
+                self.sessions.pop(token, None)
+            writer.close()
+
+    async def dispatch(self, request, connectionTokens, source=None):
+        command = request.get('command')
+        if command == 'register':
+            return await self.register(request)
+        if command == 'login':
+            return await self.login(request, connectionTokens, source)
+
+        email = self.sessions.get(request.get('token'))
+        if email is None:
+            return {'ok': False, 'message': ErrorMessages.getMessage("notLoggedIn")}
+
+        if command == 'logout':
+            self.sessions.pop(request['token'], None)
+            connectionTokens.discard(request['token'])
+            return {'ok': True, 'message': "✅ Logged out successfully."}
+        if command == 'viewReport':
+            report = await self.runStorage(self.tracker.viewReport, email=email)
+            if report is None:
+                return {'ok': False, 'message': "❌ Could not generate the report."}
+            return {'ok': True, 'message': "✅ Report generated.", 'report': report}
+        if command == 'viewPeriodReport':
+            report = await self.runStorage(self.tracker.viewPeriodReport, request.get('period', 'month'), email=email)
+            if report is None:
+                return {'ok': False, 'message': "❌ Could not generate the report."}
+            return {'ok': True, 'message': "✅ Report generated.", 'report': report}
+        if command == 'viewAnalytics':
+            report = await self.runStorage(self.tracker.viewAnalytics, int(request.get('topN', 5)), email=email)
+            if report is None:
+                return {'ok': False, 'message': "❌ Could not generate the report."}
+            return {'ok': True, 'message': "✅ Report generated.", 'report': report}
+        if command == 'addExpense':
+            message = await self.runStorage(self.tracker.addExpense, self.parseName(request, 'category'),
+                                            self.parseAmount(request), email=email)
+        elif command == 'addIncome':
+            message = await self.runStorage(self.tracker.addIncome, self.parseName(request, 'source'),
+                                            self.parseAmount(request), email=email)
+        elif command == 'setBudget':
+            message = await self.runStorage(self.tracker.setBudget, self.parseAmount(request), email=email)
+        elif command == 'addTransactions':
+            message = await self.runStorage(self.tracker.addTransactions, request.get('records', []), email=email)
+        else:
+            message = ErrorMessages.getMessage("invalidChoice")
+        return {'ok': message.startswith("✅"), 'message': message}
+
+    @staticmethod
+    def parseName(request, field):
+        name = request.get(field)
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError(f"{field} cannot be empty")
+        return name
+
+    @staticmethod
+    def parseAmount(request):
+        try:
+            amount = float(request.get('amount'))
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid amount {request.get('amount')!r}")
+        # float() also accepts "nan" and "inf", which would leave the user's totals permanently NaN or infinite
+        if not math.isfinite(amount):
+            raise ValueError(f"invalid amount {request.get('amount')!r}")
+        return amount
+
+    async def register(self, request):
+        fields = {key: request.get(key) for key in ('email', 'password', 'name', 'age', 'username')}
+        errorMessage, username = await self.runStorage(self.tracker.validateRegistration, **fields)
+        if errorMessage:
+            return {'ok': False, 'message': errorMessage}
+        hashedPassword = await asyncio.wrap_future(self.hasher.submitHash(fields['password']))
+        message = await self.runStorage(self.tracker.createUser, fields['email'], hashedPassword,
+                                        fields['name'], fields['age'], username)
+        return {'ok': message.startswith("✅"), 'message': message}
+
+    async def login(self, request, connectionTokens, source=None):
+        identifier = request.get('identifier') or ''
+        password = request.get('password') or ''
+        rateLimiter = self.tracker.rateLimiter
+        wait = rateLimiter.retryAfter(identifier, source)
+        if wait:
+            # Refused before any lookup or bcrypt work, so a flood of bad attempts stays cheap
+            return {'ok': False, 'message': RateLimiter.tooManyAttemptsMessage(wait), 'retryAfter': wait}
+        user = await self.runStorage(self.tracker.findUser, identifier)
+        if user is None:
+            rateLimiter.recordFailure(identifier, source)
+            return {'ok': False, 'message': ErrorMessages.getMessage("loginFailed")}
+        try:
+            matches = await asyncio.wrap_future(self.hasher.submitCheck(user['password'], password))
+        except ValueError:
+            matches = False
+        if not matches:
+            rateLimiter.recordFailure(identifier, source)
+            return {'ok': False, 'message': ErrorMessages.getMessage("incorrectPassword")}
+        rateLimiter.recordSuccess(identifier)
+        if self.hasher.needsRehash(user['password']):
+            newHash = await asyncio.wrap_future(self.hasher.submitHash(password))
+            await self.runStorage(self.tracker.setPasswordHash, user['email'], newHash)
+
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = user['email']
+        connectionTokens.add(token)
+        return {'ok': True, 'message': "✅ Login successful.", 'token': token}
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.handleClient, host, port)
+        print(f"✅ Finance service listening on {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.runStorage(self.tracker.close)
+            self.storageExecutor.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Personal Finance Tracker service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--file", default='NewfinanceData.json')
+    parser.add_argument("--journaled", action="store_true", help="append mutations to a journal instead of rewriting the file")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--hash-workers", type=int)
+    args = parser.parse_args()
+
+    tracker = FinanceTracker(args.file, journaled=args.journaled,
+                             passwordHasher=PasswordHasher(rounds=args.bcrypt_rounds, workers=args.hash_workers))
+    try:
+        asyncio.run(FinanceService(tracker).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Exiting the service.")
+
+
+if __name__ == "__main__":
+    main()
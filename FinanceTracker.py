@@ -1,71 +1,465 @@
 from IFinanceTracker import IFinanceTracker
-from Utilities import Validator
+from Utilities import Validator, FileUtils, FileLock
 from ErrorMessages import ErrorMessages
+from Journal import Journal
+from BackgroundFlusher import BackgroundFlusher
+from PasswordHasher import PasswordHasher
+from RateLimiter import RateLimiter
+from TransactionStore import StringTable, TransactionColumns
+from Rollups import Rollups
+from BinarySnapshot import BinarySnapshot
+from BudgetAlerts import BudgetAlerts
+import contextlib
+import gzip
+import hashlib
 import json
 import os
-from datetime import datetime
-import bcrypt
+import threading
+from datetime import datetime, time
 
 
 class FinanceTracker(IFinanceTracker):
-    def __init__(self, fileName='NewfinanceData.json'):
+    def __init__(self, fileName='NewfinanceData.json', journaled=False, checkpointInterval=100, passwordHasher=None,
+                 writeBehind=False, flushIntervalMs=500, maxPendingChanges=100, snapshotFormat=None, rateLimiter=None,
+                 shared=False, alertNotifier=None):
+        if journaled and writeBehind:
+            raise ValueError("Journaled and write-behind storage cannot be combined.")
+        if journaled and shared:
+            raise ValueError("A journaled data file cannot be shared between processes.")
         self.fileName = fileName
+        self.lock = threading.RLock()  # Guards self.data against the background flusher serializing it mid-change
+        self.saveLock = threading.Lock()  # Held while writing, so a save never replaces a newer snapshot on disk
+        self.savedVersion = 0  # Version of the newest snapshot written to disk by this process
+        self.passwordHasher = passwordHasher or PasswordHasher()
+        self.rateLimiter = rateLimiter or RateLimiter()  # Failed logins are throttled in memory, never persisted
+        self.alertNotifier = alertNotifier  # Receives budget threshold crossings, e.g. a QueueNotifier or FileNotifier
         self.data = {"users": {}, "currentUser": None}
+        self.usernameIndex = {}  # username -> email, kept in step with self.data['users']
+        self.stringTable = StringTable()  # Category/source names shared by every user's TransactionColumns
+        # In journaled mode each mutation is appended to a log and the snapshot is only rewritten on checkpoint
+        self.journal = Journal(f"{fileName}.journal") if journaled else None
+        self.checkpointInterval = checkpointInterval
+        # 'json', 'binary' or 'binary+zlib'; None keeps whatever format the file already has (JSON for new files)
+        self.snapshotFormat = snapshotFormat
+        # In shared mode several processes may use the file: saves take a file lock and merge first if the
+        # file changed since we last read or wrote it (detected by its stat stamp, confirmed by its version)
+        self.fileLock = FileLock(f"{fileName}.lock") if shared else None
+        self.diskStamp = None
+        self.baseVersion = 0  # The file's version counter when we last read or wrote it
+        self.unsynced = []  # Shared mode: records applied here but not saved yet, re-applied after a merge
+        self.batchDepth = 0  # Inside batch() changes are applied in memory and saved once at the end
+        self.batchDirty = False
+        self.flusher = None
         self.loadData()
+        # In write-behind mode mutations only mark the data dirty and a background thread saves it
+        if writeBehind:
+            self.flusher = BackgroundFlusher(self.saveData, flushIntervalMs, maxPendingChanges)
 
     def loadData(self):
+        self.stringTable = StringTable()
         try:
-            with open(self.fileName, 'r') as file:
-                self.data = json.load(file)
+            with open(self.fileName, 'rb') as file:
+                content = file.read()
+                self.diskStamp = self.fileStamp(os.fstat(file.fileno()))
+            self.data = self.decodeSnapshot(content)
         except FileNotFoundError:
             print("⚠️ Data file not found. Initializing a new data file...")
             self.data = {"users": {}, "currentUser": None}
             self.saveData()
-        except json.JSONDecodeError:
+        except ValueError:  # json.JSONDecodeError or a damaged binary snapshot
             print("⚠️ The data file appears to be corrupted. A new file will be initialized.")
             backupFileName = f"{self.fileName}.{datetime.now().strftime('%Y%m%d%H%M%S')}.bak"
             os.rename(self.fileName, backupFileName)
             print(f"⚠️ Corrupted file backed up as {backupFileName}.")
             self.data = {"users": {}, "currentUser": None}
+            self.stringTable = StringTable()
             self.saveData()
         except Exception as e:
             print(f"❌ An unexpected error occurred: {e}")
             self.data = {"users": {}, "currentUser": None}
+            self.stringTable = StringTable()
+        self.baseVersion = self.data.get('version', 0)
+        for userData in self.data['users'].values():
+            self.prepareUser(userData)
+        self.rebuildUsernameIndex()
+        self.replayJournal()
+
+    def decodeSnapshot(self, content):
+        """Parses a JSON or binary snapshot; binary columns are built on self.stringTable."""
+        if BinarySnapshot.isBinary(content):
+            if self.snapshotFormat is None:
+                compressed = BinarySnapshot.readHeader(content) & BinarySnapshot.COMPRESSED
+                self.snapshotFormat = 'binary+zlib' if compressed else 'binary'
+            return BinarySnapshot.loads(content, self.stringTable)
+        return json.loads(content)
+
+    def encodeSnapshot(self):
+        self.baseVersion += 1
+        self.data['version'] = self.baseVersion
+        if self.snapshotFormat in ('binary', 'binary+zlib'):
+            return BinarySnapshot.dumps(self.data, self.stringTable, compress=self.snapshotFormat == 'binary+zlib')
+        data = dict(self.data, users={email: self.storedFields(user) for email, user in self.data['users'].items()})
+        return json.dumps(data, indent=4, default=self.toJson)
+
+    @staticmethod
+    def fileStamp(stat):
+        # Saves replace the file by rename, so any save by any process changes at least the inode
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def currentDiskStamp(self):
+        try:
+            return self.fileStamp(os.stat(self.fileName))
+        except FileNotFoundError:
+            return None
+
+    def refresh(self):
+        """Shared mode: picks up changes another process saved since we last read or wrote the file."""
+        if self.fileLock is not None and self.currentDiskStamp() != self.diskStamp:
+            with self.lock:
+                self.mergeFromDisk()
+
+    def mergeFromDisk(self):
+        """
+        Replaces self.data with the snapshot on disk and re-applies this process's unsaved records on top.
+        currentUser is kept, since each process has its own session. A registration that another process
+        made first is dropped.
+        """
+        stringTable, currentUser = self.stringTable, self.data.get('currentUser')
+        self.stringTable = StringTable()
+        try:
+            with open(self.fileName, 'rb') as file:
+                content = file.read()
+                stamp = self.fileStamp(os.fstat(file.fileno()))
+            diskData = self.decodeSnapshot(content)
+        except (FileNotFoundError, ValueError) as e:
+            # Removed or unreadable; keep our copy, the next save writes it out whole
+            print(f"⚠️ Could not re-read {self.fileName} ({e}); keeping the data in memory.")
+            self.stringTable = stringTable
+            return
+        self.diskStamp = stamp
+        if diskData.get('version', 0) == self.baseVersion:
+            self.stringTable = stringTable  # Touched but not re-saved; nothing new to merge
+            return
+        self.data = diskData
+        self.data['currentUser'] = currentUser
+        self.baseVersion = diskData.get('version', 0)
+        for userData in self.data['users'].values():
+            self.prepareUser(userData)
+        self.rebuildUsernameIndex()
+        pending, self.unsynced = self.unsynced, []
+        for record in pending:
+            if record['op'] == 'register' and (record['user']['email'] in self.data['users']
+                                               or record['user']['username'] in self.usernameIndex):
+                print(f"⚠️ Registration of {record['user']['email']} was dropped: another process registered it first.")
+                continue
+            try:
+                self.applyRecord(record)
+            except KeyError as e:
+                print(f"⚠️ Dropped a {record['op']} change for unknown user {e}.")
+                continue
+            self.unsynced.append(record)
+
+    def prepareUser(self, userData):
+        # JSON lists of entry dicts become columnar storage; they are turned back into lists only in saveData.
+        # Binary snapshots already load as columns
+        if not isinstance(userData.get('expenses'), TransactionColumns):
+            userData['expenses'] = TransactionColumns.fromList(userData.get('expenses', []), 'category', self.stringTable)
+        if not isinstance(userData.get('income'), TransactionColumns):
+            userData['income'] = TransactionColumns.fromList(userData.get('income', []), 'source', self.stringTable)
+        # Files written before running totals existed get them computed once here
+        if 'totals' not in userData:
+            userData['totals'] = self.computeTotals(userData)
+
+    @staticmethod
+    def ensureRollups(userData):
+        # Rollups are derived from the entries and never saved; only period reports need them, so they are built
+        # by the first one and kept up to date by addEntry after that. Entries without a date land in "undated"
+        if 'rollups' not in userData:
+            userData['rollups'] = Rollups.compute(userData)
+        return userData
+
+    @staticmethod
+    def storedFields(userData):
+        """The fields of a user that are written to disk."""
+        return {field: value for field, value in userData.items() if field != 'rollups'}
+
+    @staticmethod
+    def computeTotals(userData):
+        totals = Rollups.emptyBucket()
+        for source, amount, _, count, _ in userData['income'].records():
+            Rollups.addToBucket(totals, 'income', source, amount, count)
+        for category, amount, _, count, _ in userData['expenses'].records():
+            Rollups.addToBucket(totals, 'expenses', category, amount, count)
+        return totals
+
+    @staticmethod
+    def addEntry(userData, kind, key, amount, date=None):
+        """Appends one entry and updates the running totals, and the time rollups if they were built, with it."""
+        timestamp = datetime.fromisoformat(date).timestamp() if date else None
+        userData['expenses' if kind == 'expenses' else 'income'].add(key, amount, timestamp)
+        Rollups.addToBucket(userData['totals'], kind, key, amount)
+        if 'rollups' in userData:
+            Rollups.add(userData['rollups'], kind, key, amount, timestamp)
+
+    def repairAggregates(self, userEmail, userData):
+        """Recomputes totals and rollups from the raw entries. Returns True if either had drifted."""
+        repaired = False
+        expectedTotals = self.computeTotals(userData)
+        # Compacted summaries add amounts in a different order, so only a real difference counts as drift
+        if not Rollups.closeTo(expectedTotals, userData.get('totals')):
+            print(f"⚠️ Report totals for {userEmail} were out of date and have been recomputed.")
+            userData['totals'] = expectedTotals
+            repaired = True
+        if 'rollups' not in userData:
+            return repaired  # Not built yet, so they will be computed from the entries when first needed
+        expectedRollups = Rollups.compute(userData)
+        if not Rollups.closeTo(expectedRollups, userData['rollups']):
+            print(f"⚠️ Period rollups for {userEmail} were out of date and have been recomputed.")
+            userData['rollups'] = expectedRollups
+            repaired = True
+        return repaired
+
+    def verifyTotals(self, email=None):
+        """Recomputes running totals and rollups from the raw entries and repairs any drift. Returns the number of users repaired."""
+        emails = [email] if email is not None else list(self.data['users'])
+        repaired = 0
+        for userEmail in emails:
+            if self.repairAggregates(userEmail, self.getUser(userEmail)):
+                repaired += 1
+        if repaired:
+            self.saveData()
+        return repaired
+
+    def buildUsernameIndex(self):
+        # The first registered user keeps a username, matching the old first-match scan in login
+        index = {}
+        for email, userData in self.data['users'].items():
+            index.setdefault(userData.get('username'), email)
+        return index
+
+    def rebuildUsernameIndex(self):
+        self.usernameIndex = self.buildUsernameIndex()
+
+    def verifyUsernameIndex(self):
+        """Rebuilds the username index if it disagrees with the stored users. Returns True if it was consistent."""
+        expected = self.buildUsernameIndex()
+        if expected == self.usernameIndex:
+            return True
+        print("⚠️ Username index was out of date and has been rebuilt.")
+        self.usernameIndex = expected
+        return False
+
+    def findEmailByUsername(self, username):
+        email = self.usernameIndex.get(username)
+        user = self.data['users'].get(email)
+        if email is not None and (user is None or user.get('username') != username):
+            # The index points somewhere stale, e.g. after self.data was edited directly
+            self.verifyUsernameIndex()
+            email = self.usernameIndex.get(username)
+        return email
+
+    def replayJournal(self):
+        # Re-apply mutations logged after the last checkpoint so a crash before checkpointing loses nothing
+        if self.journal is None:
+            return
+        for record in self.journal.replay(self.data.get('journalSeq', 0)):
+            try:
+                self.applyRecord(record)
+            except KeyError as e:
+                print(f"⚠️ Skipping journal record {record.get('seq')} for unknown user {e}.")
+            self.data['journalSeq'] = record['seq']
+
+    def checkpoint(self):
+        """Folds the journal into the snapshot file and truncates the journal."""
+        self.saveData()
+        if self.journal is not None:
+            self.journal.truncate()
+
+    def commit(self, record):
+        with self.lock:
+            self.applyRecord(record)
+            if self.fileLock is not None:
+                self.unsynced.append(record)
+            if self.journal is None:
+                if self.batchDepth:
+                    self.batchDirty = True
+                else:
+                    self.persist(record)
+                return
+            record['seq'] = self.data.get('journalSeq', 0) + 1
+            self.data['journalSeq'] = record['seq']
+            self.journal.append(record)
+            if self.journal.pending >= self.checkpointInterval:
+                self.checkpoint()
+
+    def persist(self, record):
+        # Without a journal every change rewrites the snapshot; storage subclasses can write less
+        if self.flusher is not None:
+            self.flusher.markDirty()
+        else:
+            self.saveData()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Defers saving until the outermost batch ends, so a run of changes costs a single save.
+        In journaled mode changes are still appended to the journal as they happen.
+        """
+        with self.lock:
+            self.batchDepth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batchDepth -= 1
+                needsSave = self.batchDepth == 0 and self.batchDirty
+                self.batchDirty = self.batchDirty and not needsSave
+            if needsSave:
+                self.saveData()
+
+    def flush(self):
+        """Writes any changes still pending in write-behind mode to disk now."""
+        if self.flusher is not None:
+            self.flusher.flush()
+
+    def close(self):
+        """Flushes pending writes, folds the journal into the snapshot and stops the background flusher."""
+        self.rateLimiter.close()
+        if self.alertNotifier is not None:
+            self.alertNotifier.close()
+        if self.flusher is not None:
+            self.flusher.close()
+        if self.journal is not None:
+            self.checkpoint()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        return False
+
+    def getUser(self, email):
+        """Returns the full user record, including transactions, for an email."""
+        return self.data['users'][email]
+
+    def applyRecord(self, record):
+        op = record['op']
+        if op == 'register':
+            user = dict(record['user'])  # Copy so the record itself stays plain JSON for the journal
+            self.prepareUser(user)
+            self.data['users'][user['email']] = user
+            self.usernameIndex.setdefault(user['username'], user['email'])
+        elif op == 'updatePassword':
+            self.getUser(record['email'])['password'] = record['password']
+        elif op == 'login':
+            self.data['currentUser'] = record['email']
+        elif op == 'logout':
+            self.data['currentUser'] = None
+        elif op == 'addExpense':
+            self.addEntry(self.getUser(record['email']), 'expenses', record['category'], record['amount'],
+                          record.get('date'))
+        elif op == 'addIncome':
+            self.addEntry(self.getUser(record['email']), 'income', record['source'], record['amount'],
+                          record.get('date'))
+        elif op == 'setBudget':
+            self.getUser(record['email'])['budget'] = record['amount']
+        elif op == 'setAlertThresholds':
+            self.getUser(record['email'])['alertThresholds'] = record['thresholds']
+        elif op == 'setCategoryBudget':
+            self.getUser(record['email']).setdefault('categoryBudgets', {})[record['category']] = record['amount']
+        elif op == 'compact':
+            # Totals already include the folded entries. Built rollups still hold them by day, so they are
+            # dropped and rebuilt from the monthly summaries by the next period report
+            user = self.getUser(record['email'])
+            user['expenses'].fold(record['before'], Rollups.monthStart)
+            user['income'].fold(record['before'], Rollups.monthStart)
+            user.pop('rollups', None)
+            user.setdefault('archives', []).append(record['archive'])
+        elif op == 'addTransactions':
+            user = self.getUser(record['email'])
+            for entry in record['entries']:
+                if entry['type'] == 'expense':
+                    self.addEntry(user, 'expenses', entry['category'], entry['amount'], entry.get('date'))
+                else:
+                    self.addEntry(user, 'income', entry['source'], entry['amount'], entry.get('date'))
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
 
     def saveData(self):
         try:
-            with open(self.fileName, 'w') as file:
-                json.dump(self.data, file, indent=4)
+            if self.fileLock is not None:
+                # Hold the file lock from the check to the rename so no other process saves in between
+                with self.lock, self.fileLock:
+                    if self.currentDiskStamp() != self.diskStamp:
+                        self.mergeFromDisk()
+                    FileUtils.writeAtomically(self.fileName, self.encodeSnapshot())
+                    self.diskStamp = self.currentDiskStamp()
+                    self.unsynced.clear()
+                return
+            with self.lock:
+                text = self.encodeSnapshot()
+                version = self.baseVersion
+            # Write outside the lock: temp file + rename, so a crash mid-write never corrupts the snapshot.
+            # Saves from different threads (the flusher, batch(), verifyTotals) can finish encoding in one
+            # order and writing in another; an older snapshot is dropped rather than replace a newer one
+            with self.saveLock:
+                if version < self.savedVersion:
+                    return
+                FileUtils.writeAtomically(self.fileName, text)
+                self.savedVersion = version
         except (PermissionError, IOError) as e:
             print(f"{ErrorMessages.getMessage('permissionError')}: {e}")
         except Exception as e:
             print(f"{ErrorMessages.getMessage('unexpectedError')}: {e}")
 
+    @staticmethod
+    def toJson(value):
+        # json.dump hook: columnar entries are written out in the original list-of-dicts layout
+        if isinstance(value, TransactionColumns):
+            return value.toList()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
     def register(self, email, password, name, age, username=None):
+        errorMessage, username = self.validateRegistration(email, password, name, age, username)
+        if errorMessage:
+            return errorMessage
+        return self.createUser(email, self.hashPassword(password), name, age, username)
+
+    def validateRegistration(self, email, password, name, age, username=None):
+        """Checks registration fields without hashing. Returns (errorMessage or None, resolved username)."""
+        self.refresh()
         if not email or not password or not name or not age:
-            return ErrorMessages.getMessage("emptyFields")
+            return ErrorMessages.getMessage("emptyFields"), username
 
         if len(password) < 8 or not any(char.isdigit() for char in password):
-            return ErrorMessages.getMessage("weakPassword")
+            return ErrorMessages.getMessage("weakPassword"), username
 
         if email in self.data['users']:
-            return ErrorMessages.getMessage("emailExists")
+            return ErrorMessages.getMessage("emailExists"), username
 
         if not Validator.isValidEmail(email):
-            return ErrorMessages.getMessage("invalidEmail")
+            return ErrorMessages.getMessage("invalidEmail"), username
 
         if not Validator.isValidAge(age):
-            return ErrorMessages.getMessage("invalidAge")
+            return ErrorMessages.getMessage("invalidAge"), username
 
         if not username:
             username = email.split('@')[0]
 
-        if not Validator.isUniqueUsername(username, self.data['users']):
-            return ErrorMessages.getMessage("usernameExists")
+        if not Validator.isUniqueUsername(username, self.data['users'], self.usernameIndex):
+            return ErrorMessages.getMessage("usernameExists"), username
 
-        hashedPassword = self.hashPassword(password)
+        return None, username
 
-        self.data['users'][email] = {
+    def createUser(self, email, hashedPassword, name, age, username):
+        """Stores a user whose password is already hashed; uniqueness is re-checked in case of a concurrent registration."""
+        if email in self.data['users']:
+            return ErrorMessages.getMessage("emailExists")
+        if not Validator.isUniqueUsername(username, self.data['users'], self.usernameIndex):
+            return ErrorMessages.getMessage("usernameExists")
+
+        self.commit({'op': 'register', 'user': {
             'username': username,
             'email': email,
             'password': hashedPassword,
@@ -74,86 +468,156 @@ class FinanceTracker(IFinanceTracker):
             'expenses': [],
             'income': [],
             'budget': 0
-        }
-        self.saveData()
+        }})
         return ErrorMessages.getMessage("registrationSuccessful")
 
-    def login(self, identifier, password):
+    def findUser(self, identifier):
+        """Returns the stored user for an email or username, or None."""
+        if not identifier:
+            return None
+        self.refresh()
         # Determine if the identifier is an email by checking for "@" and "."
         isEmail = "@" in identifier and "." in identifier.split('@')[-1]
+        if isEmail:  # If the identifier is an email
+            return self.data['users'].get(identifier)  # Fetch the user by email
+        # If the identifier is a username, resolve it through the index
+        email = self.findEmailByUsername(identifier)
+        return self.data['users'].get(email) if email is not None else None
+
+    def setPasswordHash(self, email, hashedPassword):
+        self.commit({'op': 'updatePassword', 'email': email, 'password': hashedPassword})
 
+    def login(self, identifier, password, source=None):
         if identifier:
-            user = None
-            if isEmail:  # If the identifier is an email
-                user = self.data['users'].get(identifier)  # Fetch the user by email
-            else:  # If the identifier is a username
-                for email, userData in self.data['users'].items():
-                    if userData.get('username') == identifier:  # Check if the username matches
-                        user = userData
-                        break
+            wait = self.rateLimiter.retryAfter(identifier, source)
+            if wait:
+                return RateLimiter.tooManyAttemptsMessage(wait)
+            user = self.findUser(identifier)
 
             if user:
                 if self.checkPassword(user['password'], password):
-                    # Set currentUser to the email of the logged-in user
-                    self.data['currentUser'] = user['email']  # Ensure it's the email, not the username
-                    self.saveData()  # Save data after login
+                    self.rateLimiter.recordSuccess(identifier)
+                    if self.passwordHasher.needsRehash(user['password']):
+                        # Stored with a different bcrypt cost than configured; upgrade it while we have the password
+                        self.setPasswordHash(user['email'], self.hashPassword(password))
+                    # Set currentUser to the email, not the username, and save
+                    self.commit({'op': 'login', 'email': user['email']})
                     return "✅ Login successful."
                 else:
+                    self.rateLimiter.recordFailure(identifier, source)
                     return ErrorMessages.getMessage("incorrectPassword")
             else:
+                self.rateLimiter.recordFailure(identifier, source)
                 return ErrorMessages.getMessage("loginFailed")
         else:
             return ErrorMessages.getMessage("loginFailed")
 
     def logout(self):
-        self.data['currentUser'] = None
-        self.saveData()
+        self.commit({'op': 'logout'})
         return "✅ Logged out successfully."
 
-    def addExpense(self, category, amount):
+    def addExpense(self, category, amount, timestamp=None, *, email=None):
         try:
-            self.checkLogin()
+            email = self.actingUser(email)
             if amount <= 0:
                 return "❌ Expense amount must be greater than 0."
-            user = self.data['users'][self.data['currentUser']]
-            user['expenses'].append({'category': category, 'amount': amount})
-            self.saveData()
-            return f"✅ Added expense: {category} - ${amount:.2f}"
+            with self.lock:
+                spentBefore = BudgetAlerts.spending(self.getUser(email), category)
+                self.commit({'op': 'addExpense', 'email': email, 'category': category, 'amount': amount,
+                             'date': Validator.isoTimestamp(timestamp)})
+                alerts = BudgetAlerts.check(self.getUser(email), category, spentBefore)
+            self.notifyAlerts(email, alerts)
+            return "\n".join([f"✅ Added expense: {category} - ${amount:.2f}"] + [BudgetAlerts.message(alert)
+                                                                                  for alert in alerts])
         except Exception as e:
             return f"❌ {str(e)}"
 
-    def addIncome(self, source, amount):
+    def addIncome(self, source, amount, timestamp=None, *, email=None):
         try:
-            self.checkLogin()
+            email = self.actingUser(email)
             if amount <= 0:
                 return "❌ Income amount must be greater than 0."
-            user = self.data['users'][self.data['currentUser']]
-            user['income'].append({'source': source, 'amount': amount})
-            self.saveData()
+            self.commit({'op': 'addIncome', 'email': email, 'source': source, 'amount': amount,
+                         'date': Validator.isoTimestamp(timestamp)})
             return f"✅ Added income: {source} - ${amount:.2f}"
         except Exception as e:
             return f"❌ {str(e)}"
 
-    def setBudget(self, amount):
+    def addTransactions(self, records, *, email=None):
+        """
+        Adds many expense/income records for the current user in one all-or-nothing batch.
+        Every record is validated first; if any is invalid nothing is applied. The batch is saved once.
+        """
         try:
-            self.checkLogin()
+            email = self.actingUser(email)
+            entries = []
+            rejects = []
+            for rowNumber, record in enumerate(records, start=1):
+                try:
+                    entries.append(Validator.normalizeTransaction(record))
+                except ValueError as e:
+                    rejects.append(f"row {rowNumber}: {e}")
+            if rejects:
+                return f"❌ Batch rejected, {len(rejects)} invalid record(s): " + "; ".join(rejects[:5])
+            if not entries:
+                return "❌ No transactions to add."
+            now = Validator.isoTimestamp()
+            for entry in entries:
+                entry.setdefault('date', now)  # Rows without a date are recorded as of the import
+            self.commit({'op': 'addTransactions', 'email': email, 'entries': entries})
+            expenseCount = sum(1 for entry in entries if entry['type'] == 'expense')
+            return f"✅ Added {len(entries)} transactions ({expenseCount} expenses, {len(entries) - expenseCount} income)."
+        except Exception as e:
+            return f"❌ {str(e)}"
+
+    def setBudget(self, amount, *, email=None):
+        try:
+            email = self.actingUser(email)
             if amount <= 0:
                 return "❌ Budget amount must be greater than 0."
-            user = self.data['users'][self.data['currentUser']]
-            user['budget'] = amount
-            self.saveData()
+            self.commit({'op': 'setBudget', 'email': email, 'amount': amount})
             return f"✅ Budget set to ${amount:.2f}"
         except Exception as e:
             return f"❌ {str(e)}"
 
-    def viewReport(self):
+    def setAlertThresholds(self, thresholds, *, email=None):
+        """Sets the budget percentages (e.g. 50, 80, 100) at which addExpense raises an alert."""
+        try:
+            email = self.actingUser(email)
+            thresholds = sorted({float(threshold) for threshold in thresholds})
+            if not thresholds or thresholds[0] <= 0:
+                return "❌ Alert thresholds must be percentages greater than 0."
+            self.commit({'op': 'setAlertThresholds', 'email': email, 'thresholds': thresholds})
+            return f"✅ Budget alerts set at {', '.join(f'{threshold:g}%' for threshold in thresholds)}"
+        except Exception as e:
+            return f"❌ {str(e)}"
+
+    def setCategoryBudget(self, category, amount, *, email=None):
+        """Sets a budget for one expense category; its alerts use the same thresholds as the overall budget."""
+        try:
+            email = self.actingUser(email)
+            if amount <= 0:
+                return "❌ Budget amount must be greater than 0."
+            self.commit({'op': 'setCategoryBudget', 'email': email, 'category': category, 'amount': amount})
+            return f"✅ Budget for {category} set to ${amount:.2f}"
+        except Exception as e:
+            return f"❌ {str(e)}"
+
+    def notifyAlerts(self, email, alerts):
+        if self.alertNotifier is None:
+            return
+        for alert in alerts:
+            try:
+                self.alertNotifier.notify(dict(alert, email=email, date=Validator.isoTimestamp()))
+            except Exception as e:
+                print(f"⚠️ Could not deliver a budget alert: {e}")
+
+    def viewReport(self, *, email=None):
         try:
-            self.checkLogin()  # Ensures the user is logged in
-            user = self.data['users'].get(self.data['currentUser'])
-            if user is None:
-                raise Exception("No user found.")
-            totalIncome = sum(item['amount'] for item in user['income'])
-            totalExpenses = sum(item['amount'] for item in user['expenses'])
+            user = self.getUser(self.actingUser(email))  # Ensures the user is logged in
+            # Running totals are maintained by addExpense/addIncome, so no rescan is needed here
+            totalIncome = user['totals']['income']
+            totalExpenses = user['totals']['expenses']
             budget = user['budget']
             return {
                 "Total Income": totalIncome,
@@ -165,22 +629,142 @@ class FinanceTracker(IFinanceTracker):
             print(f"❌ {e}")  # Log the error message
             return None  # Return None if there's an error
 
+    def viewPeriodReport(self, period='month', start=None, end=None, *, email=None):
+        """
+        Totals for a date range built from the daily/monthly rollups. period is one of Rollups.PERIODS,
+        or pass start and end dates (inclusive) for a custom range. Compacted history can only be reported
+        by whole months, so months the range only partly covers leave their summaries out.
+        """
+        try:
+            with self.lock:
+                rollups = self.ensureRollups(self.getUser(self.actingUser(email)))['rollups']
+            if start is None or end is None:
+                start, end = Rollups.periodBounds(period)
+                label = Rollups.PERIODS[period]
+            else:
+                label = "Custom period"
+            bucket, leftOut = Rollups.combine(rollups, start, end)
+            undated = rollups['undated']
+            return {
+                "Period": f"{label} ({start.isoformat()} to {end.isoformat()})",
+                "Total Income": bucket['income'],
+                "Total Expenses": bucket['expenses'],
+                "Net": bucket['income'] - bucket['expenses'],
+                "Expenses by Category": bucket['byCategory'],
+                "Income by Source": bucket['bySource'],
+                "Undated Entries": undated['incomeCount'] + undated['expenseCount'],
+                "Compacted Entries Left Out": leftOut['incomeCount'] + leftOut['expenseCount']
+            }
+        except Exception as e:
+            print(f"❌ {e}")
+            return None
+
+    def viewAnalytics(self, topN=5, *, email=None):
+        """Category breakdowns, means, percentiles and top-N categories, computed with NumPy."""
+        try:
+            user = self.getUser(self.actingUser(email))
+            from Analytics import Analytics  # NumPy is only needed for analytics
+            expenseAmounts, expenseCodes = Analytics.columnArrays(user['expenses'])
+            incomeAmounts, incomeCodes = Analytics.columnArrays(user['income'])
+            names = self.stringTable.strings
+            return Analytics.summarize(expenseAmounts, expenseCodes, names, incomeAmounts, incomeCodes, names, topN,
+                                       Analytics.summaryArrays(user['expenses']), Analytics.summaryArrays(user['income']))
+        except Exception as e:
+            print(f"❌ {e}")
+            return None
+
+    def searchTransactions(self, kind='expenses', prefix=None, contains=None, minAmount=None, maxAmount=None,
+                           start=None, end=None, *, email=None):
+        """
+        Finds a user's expenses (or income, kind='income') whose category/source has words starting with
+        prefix and/or contains the given text, with amounts and dates (inclusive) in the given ranges.
+        Matches are looked up in the entries' search index and returned as an iterator that builds each
+        entry dict only when it is reached, so callers can page through large results. Returns None on error.
+        """
+        try:
+            if kind not in ('expenses', 'income'):
+                raise ValueError(f"Unknown transaction kind: {kind}")
+            with self.lock:
+                columns = self.getUser(self.actingUser(email))[kind]
+                positions = columns.searchIndex().search(
+                    prefix, contains, minAmount, maxAmount,
+                    datetime.combine(start, time.min).timestamp() if start else None,
+                    datetime.combine(end, time.max).timestamp() if end else None)
+            return (columns[position] for position in positions)
+        except Exception as e:
+            print(f"❌ {e}")
+            return None
+
+    def compactHistory(self, retentionDays=365, *, email=None):
+        """
+        Folds transactions older than retentionDays into one summary entry per month and category/source
+        and archives the originals to a gzip JSONL file beside the data file. Totals and entry counts are
+        unchanged. Compacts every user, or only email; the caller saves (see batch()).
+        Returns {'users', 'archivedEntries', 'archiveBytes'}.
+        """
+        before = datetime.now().timestamp() - retentionDays * 24 * 3600
+        stats = {'users': 0, 'archivedEntries': 0, 'archiveBytes': 0}
+        for userEmail in ([email] if email is not None else list(self.data['users'])):
+            user = self.getUser(userEmail)
+            lines = [json.dumps(dict(entry, type=entryType))
+                     for kind, entryType in (('expenses', 'expense'), ('income', 'income'))
+                     for entry in user[kind].foldedEntries(before, Rollups.monthStart)]
+            if not lines:
+                continue
+            # Archive names are unique per run; one left behind by a crash before saving is simply never referenced
+            archiveName = (f"{hashlib.sha1(userEmail.encode()).hexdigest()[:16]}-"
+                           f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}.jsonl.gz")
+            os.makedirs(self.archiveDir(), exist_ok=True)
+            content = gzip.compress(("\n".join(lines) + "\n").encode())
+            FileUtils.writeAtomically(os.path.join(self.archiveDir(), archiveName), content)
+            self.commit({'op': 'compact', 'email': userEmail, 'before': before, 'archive': {
+                'file': archiveName,
+                'before': datetime.fromtimestamp(before).isoformat(timespec='seconds'),
+                'entries': len(lines),
+            }})
+            stats['users'] += 1
+            stats['archivedEntries'] += len(lines)
+            stats['archiveBytes'] += len(content)
+        return stats
+
+    def archiveDir(self):
+        return f"{self.fileName}.archive"
+
+    def readArchivedTransactions(self, *, email=None):
+        """Yields a user's archived original entries, oldest archive first, reading the archives only now."""
+        user = self.getUser(self.actingUser(email))
+        for archive in user.get('archives', []):
+            with gzip.open(os.path.join(self.archiveDir(), archive['file']), 'rt') as file:
+                for line in file:
+                    yield json.loads(line)
+
     def checkLogin(self):
         if self.data['currentUser'] is None:
             raise Exception(ErrorMessages.getMessage("notLoggedIn"))
+
+    def actingUser(self, email=None):
+        # Callers that manage their own sessions (FinanceService) pass the email; otherwise use currentUser
+        self.refresh()
+        if email is None:
+            self.checkLogin()
+            email = self.data['currentUser']
+        if email not in self.data['users']:
+            raise Exception("No user found.")
+        return email
     def userExists(self, identifier):
+        self.refresh()
         if identifier in self.data['users']:
             # Direct match as email (primary key)
             return True
-            # Check for username in all users
-        return any(userInfo["username"] == identifier for userInfo in self.data['users'].values())
+        # Check for username through the index
+        return self.findEmailByUsername(identifier) is not None
 
     def hashPassword(self, password):
-        """Hashes the password using bcrypt."""
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        """Hashes the password using bcrypt on the hasher's worker pool."""
+        return self.passwordHasher.hash(password)
 
     def checkPassword(self, storedHash, password):
-        return bcrypt.checkpw(password.encode(), storedHash.encode())
+        return self.passwordHasher.check(storedHash, password)
 
     def getCurrentUser(self):
         return self.data.get('currentUser')
@@ -1,9 +1,14 @@
 from FinanceTracker import FinanceTracker
 from IFinanceTracker import IFinanceTracker
 from ErrorMessages import ErrorMessages  # Import ErrorMessages class
+from datetime import date
+import itertools
 
 
 class FinanceTrackerApp:
+    countFields = ("Undated Entries", "Compacted Entries Left Out", "Expense Count", "Income Count")  # Report values that are counts rather than money
+    pageSize = 10  # Search results shown per page
+
     def __init__(self, tracker: IFinanceTracker):
         self.tracker = tracker  # Aggregation: App uses a tracker instance
 
@@ -92,6 +97,76 @@ class FinanceTrackerApp:
 
 
 
+    def printReport(self, title, report):
+        if not report:  # Check if report is not None or empty
+            print("❌ Could not generate the report.")
+            return
+        print(f"\n--- {title} ---")
+        for key, value in report.items():
+            if isinstance(value, dict):  # Breakdowns, e.g. expenses by category
+                print(f"{key}:")
+                for name, amount in value.items():
+                    print(f"  {name}: ${amount:.2f}")
+            elif isinstance(value, (int, float)) and key not in self.countFields:  # Format numerical values
+                print(f"{key}: ${value:.2f}")
+            else:
+                print(f"{key}: {value}")
+
+    def budgetAlertsMenu(self):
+        print("1. Set alert thresholds")
+        print("2. Set a category budget")
+        choice = input("Choose an option: ")
+        try:
+            if choice == '1':
+                thresholds = input("Enter percentages separated by commas (e.g. 50, 80, 100): ")
+                print(self.tracker.setAlertThresholds([float(value) for value in thresholds.split(",")]))
+            elif choice == '2':
+                category = input("Enter expense category: ")
+                amount = float(input("Enter budget amount: "))
+                print(self.tracker.setCategoryBudget(category, amount))
+            else:
+                self.printError(ErrorMessages.getMessage("invalidChoice"))
+        except ValueError:
+            self.printError(ErrorMessages.getMessage("unexpectedError"))
+
+    def searchMenu(self):
+        print("1. Expenses")
+        print("2. Income")
+        kind = {'1': 'expenses', '2': 'income'}.get(input("Search in: "))
+        if kind is None:
+            self.printError(ErrorMessages.getMessage("invalidChoice"))
+            return
+        keyName = 'category' if kind == 'expenses' else 'source'
+        print("Leave any field blank to skip it.")
+        try:
+            prefix = input(f"{keyName.capitalize()} starts with: ").strip() or None
+            contains = input(f"{keyName.capitalize()} contains: ").strip() or None
+            minAmount = input("Minimum amount: ").strip()
+            maxAmount = input("Maximum amount: ").strip()
+            start = input("From date (YYYY-MM-DD): ").strip()
+            end = input("To date (YYYY-MM-DD): ").strip()
+            results = self.tracker.searchTransactions(
+                kind, prefix, contains, float(minAmount) if minAmount else None, float(maxAmount) if maxAmount else None,
+                date.fromisoformat(start) if start else None, date.fromisoformat(end) if end else None)
+        except ValueError:
+            self.printError(ErrorMessages.getMessage("unexpectedError"))
+            return
+        if results is None:
+            return
+
+        # Entries are fetched a page at a time, so a huge result set is never held in memory
+        shown = 0
+        while True:
+            page = list(itertools.islice(results, self.pageSize))
+            for entry in page:
+                shown += 1
+                count = f" ({entry['count']} entries)" if entry.get('summary') else ""
+                print(f"{shown}. {entry.get('date', 'undated')}  {entry[keyName]}: ${entry['amount']:.2f}{count}")
+            if len(page) < self.pageSize or input("Press Enter for more, or q to stop: ").strip().lower() == 'q':
+                break
+        if not shown:
+            print("No matching transactions.")
+
     def mainMenu(self):
         print("\n--- Personal Finance Tracker ---")
         print("1. Logout")
@@ -99,7 +174,11 @@ class FinanceTrackerApp:
         print("3. Add Income")
         print("4. Set Budget")
         print("5. View Report")
-        print("6. Exit")
+        print("6. View Period Report")
+        print("7. View Spending Analytics")
+        print("8. Budget Alerts")
+        print("9. Search Transactions")
+        print("10. Exit")
 
         choice = input("Choose an option: ")
 
@@ -127,18 +206,28 @@ class FinanceTrackerApp:
                 self.printError(ErrorMessages.getMessage("unexpectedError"))
 
         elif choice == '5':
-            report = self.tracker.viewReport()
-            if report:  # Check if report is not None or empty
-                print("\n--- Financial Report ---")
-                for key, value in report.items():
-                    if isinstance(value, (int, float)):  # Format numerical values
-                        print(f"{key}: ${value:.2f}")
-                    else:
-                        print(f"{key}: {value}")
-            else:
-                print("❌ Could not generate the report.")
+            self.printReport("Financial Report", self.tracker.viewReport())
 
         elif choice == '6':
+            print("1. This month")
+            print("2. Last 90 days")
+            print("3. Year to date")
+            period = {'1': 'month', '2': '90days', '3': 'ytd'}.get(input("Choose a period: "))
+            if period:
+                self.printReport("Period Report", self.tracker.viewPeriodReport(period))
+            else:
+                self.printError(ErrorMessages.getMessage("invalidChoice"))
+
+        elif choice == '7':
+            self.printReport("Spending Analytics", self.tracker.viewAnalytics())
+
+        elif choice == '8':
+            self.budgetAlertsMenu()
+
+        elif choice == '9':
+            self.searchMenu()
+
+        elif choice == '10':
             print("Exiting the application.")
             return False  # Exit the application
 
@@ -148,31 +237,35 @@ class FinanceTrackerApp:
         return True  # Continue the loop
 
     def run(self):
-        while True:
-            if not self.handleLoginCheck():
-                print("\n--- Personal Finance Tracker ---")
-                print("Welcome!")
-                print("1. Register")
-                print("2. Login")
-                print("3. Exit")
-                choice = input("Choose an option: ")
-
-                if choice == '1':
-                    self.registerUser()
-                elif choice == '2':
-                    username = input("Enter username or email: ")
-                    password = input("Enter password: ")
-                    loginMessage = self.tracker.login(username, password)
-                    if "✅ Login successful." in loginMessage:
-                        print(loginMessage)
-                    else:
-                        self.printError(loginMessage)
+        try:
+            while True:
+                if not self.handleLoginCheck():
+                    print("\n--- Personal Finance Tracker ---")
+                    print("Welcome!")
+                    print("1. Register")
+                    print("2. Login")
+                    print("3. Exit")
+                    choice = input("Choose an option: ")
+
+                    if choice == '1':
+                        self.registerUser()
+                    elif choice == '2':
+                        username = input("Enter username or email: ")
+                        password = input("Enter password: ")
+                        loginMessage = self.tracker.login(username, password)
+                        if "✅ Login successful." in loginMessage:
+                            print(loginMessage)
+                        else:
+                            self.printError(loginMessage)
 
-                elif choice == '3':
-                    print("Exiting the application.")
-                    break  # Exit the application
+                    elif choice == '3':
+                        print("Exiting the application.")
+                        break  # Exit the application
+                    else:
+                        self.printError(ErrorMessages.getMessage("invalidChoice"))
                 else:
-                    self.printError(ErrorMessages.getMessage("invalidChoice"))
-            else:
-                if not self.mainMenu():
-                    break  # Exit the application if user selects exit or logout
+                    if not self.mainMenu():
+                        break  # Exit the application if user selects exit or logout
+        finally:
+            # Make sure write-behind or journaled changes reach disk however the app exits
+            self.tracker.close()
@@ -0,0 +1,41 @@
+import argparse
+import os
+
+from FinanceTracker import FinanceTracker
+
+
+def compactDataFile(fileName='NewfinanceData.json', retentionDays=365, email=None):
+    """
+    Maintenance command: compacts history older than retentionDays in fileName with a single save and
+    reports how many bytes the data file shrank by. Returns the stats from FinanceTracker.compactHistory.
+    """
+    if not os.path.exists(fileName):
+        raise FileNotFoundError(f"No data file at {fileName}")
+    sizeBefore = os.path.getsize(fileName)
+    tracker = FinanceTracker(fileName)
+    with tracker.batch():
+        stats = tracker.compactHistory(retentionDays, email=email)
+    tracker.close()
+    stats['bytesReclaimed'] = sizeBefore - os.path.getsize(fileName)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fold old transactions into monthly summaries and archive the detail")
+    parser.add_argument("fileName", nargs="?", default="NewfinanceData.json")
+    parser.add_argument("--retention-days", type=int, default=365,
+                        help="keep individual transactions this recent (default: %(default)s)")
+    parser.add_argument("--email", help="compact only this user")
+    args = parser.parse_args()
+
+    stats = compactDataFile(args.fileName, args.retention_days, args.email)
+    if not stats['users']:
+        print(f"✅ Nothing older than {args.retention_days} days to compact.")
+        return
+    print(f"✅ Archived {stats['archivedEntries']} transactions for {stats['users']} users "
+          f"({stats['archiveBytes']:,} bytes compressed).")
+    print(f"✅ Reclaimed {stats['bytesReclaimed']:,} bytes in {args.fileName}.")
+
+
+if __name__ == "__main__":
+    main()
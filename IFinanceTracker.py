@@ -1,5 +1,6 @@
 
 from abc import ABC, abstractmethod
+from datetime import date, datetime
 
 
 class IFinanceTracker(ABC):  # Interface for FinanceTracker
@@ -8,7 +9,8 @@ class IFinanceTracker(ABC):  # Interface for FinanceTracker
         pass
 
     @abstractmethod
-    def login(self, username: str, password: str) -> str:
+    def login(self, username: str, password: str, source: str = None) -> str:
+        """source identifies where the attempt comes from (e.g. a client address) for rate limiting."""
         pass
 
     @abstractmethod
@@ -16,11 +18,16 @@ class IFinanceTracker(ABC):  # Interface for FinanceTracker
         pass
 
     @abstractmethod
-    def addExpense(self, category: str, amount: float) -> str:
+    def addExpense(self, category: str, amount: float, timestamp: datetime = None) -> str:
         pass
 
     @abstractmethod
-    def addIncome(self, source: str, amount: float) -> str:
+    def addIncome(self, source: str, amount: float, timestamp: datetime = None) -> str:
+        pass
+
+    @abstractmethod
+    def addTransactions(self, records: list) -> str:
+        """Adds a batch of expense/income records all-or-nothing and persists once."""
         pass
 
     @abstractmethod
@@ -31,6 +38,16 @@ class IFinanceTracker(ABC):  # Interface for FinanceTracker
     def viewReport(self) -> dict:
         pass
 
+    @abstractmethod
+    def viewPeriodReport(self, period: str = 'month', start: date = None, end: date = None) -> dict:
+        """Totals for 'month', '90days', 'ytd' or an explicit start..end date range."""
+        pass
+
+    @abstractmethod
+    def viewAnalytics(self, topN: int = 5) -> dict:
+        """Per-category/source totals, means, percentiles and the top-N expense categories."""
+        pass
+
     @abstractmethod
     def getCurrentUser(self) -> str:
         """Returns the currently logged-in user or None."""
@@ -43,3 +60,21 @@ class IFinanceTracker(ABC):  # Interface for FinanceTracker
     @abstractmethod
     def userExists(self, username: str) -> object:  # New method to check if a user exists
         pass
+
+    def searchTransactions(self, kind: str = 'expenses', prefix: str = None, contains: str = None,
+                           minAmount: float = None, maxAmount: float = None, start: date = None, end: date = None):
+        """Iterator over the entries matching a name, amount and date query. Optional for implementations."""
+        print("❌ Searching is not supported by this storage backend.")
+        return None
+
+    def setAlertThresholds(self, thresholds: list) -> str:
+        """Budget percentages at which addExpense raises an alert. Optional for implementations."""
+        return "❌ Budget alerts are not supported by this storage backend."
+
+    def setCategoryBudget(self, category: str, amount: float) -> str:
+        """A budget for one expense category, alerted on like the overall one. Optional for implementations."""
+        return "❌ Budget alerts are not supported by this storage backend."
+
+    def close(self) -> None:
+        """Releases resources and makes sure pending writes reach disk. Optional for implementations."""
+        pass
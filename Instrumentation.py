@@ -0,0 +1,190 @@
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+from IFinanceTracker import IFinanceTracker
+from Utilities import FileUtils
+
+
+class Metrics:
+    """
+    Call counts, latency histograms and bytes read/written per tracker operation.
+
+    Latencies go into fixed buckets (upper bounds in milliseconds), so recording a call is one bisect and
+    a few additions under a lock. With enabled=False the instrumented methods skip the timing altogether.
+    """
+
+    BUCKET_BOUNDS_MS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.operations = {}
+        self.startedAt = time.time()
+
+    def emptyOperation(self):
+        return {"calls": 0, "errors": 0, "totalMs": 0.0, "maxMs": 0.0,
+                "buckets": [0] * (len(self.BUCKET_BOUNDS_MS) + 1), "bytesRead": 0, "bytesWritten": 0}
+
+    def record(self, name, seconds, failed=False, bytesRead=0, bytesWritten=0):
+        elapsedMs = seconds * 1000
+        bucket = bisect.bisect_left(self.BUCKET_BOUNDS_MS, elapsedMs)
+        with self.lock:
+            operation = self.operations.get(name)
+            if operation is None:
+                operation = self.operations[name] = self.emptyOperation()
+            operation['calls'] += 1
+            operation['errors'] += failed
+            operation['totalMs'] += elapsedMs
+            operation['maxMs'] = max(operation['maxMs'], elapsedMs)
+            operation['buckets'][bucket] += 1
+            operation['bytesRead'] += bytesRead
+            operation['bytesWritten'] += bytesWritten
+
+    def percentile(self, buckets, calls, fraction):
+        # Upper bound of the bucket holding the requested rank; the overflow bucket reports the largest bound
+        rank = fraction * calls
+        seen = 0
+        for index, count in enumerate(buckets):
+            seen += count
+            if seen >= rank:
+                return self.BUCKET_BOUNDS_MS[min(index, len(self.BUCKET_BOUNDS_MS) - 1)]
+        return self.BUCKET_BOUNDS_MS[-1]
+
+    def snapshot(self):
+        """Returns a JSON-ready copy of every operation's counters; percentiles are bucket upper bounds."""
+        with self.lock:
+            operations = {name: dict(operation, buckets=list(operation['buckets']))
+                          for name, operation in self.operations.items()}
+        labels = [f"<={bound}ms" for bound in self.BUCKET_BOUNDS_MS] + [f">{self.BUCKET_BOUNDS_MS[-1]}ms"]
+        report = {}
+        for name, operation in sorted(operations.items()):
+            calls = operation['calls']
+            report[name] = {
+                "calls": calls,
+                "errors": operation['errors'],
+                "totalMs": operation['totalMs'],
+                "meanMs": operation['totalMs'] / calls if calls else 0.0,
+                "maxMs": operation['maxMs'],
+                "p50Ms": self.percentile(operation['buckets'], calls, 0.50),
+                "p99Ms": self.percentile(operation['buckets'], calls, 0.99),
+                "histogram": {label: count for label, count in zip(labels, operation['buckets']) if count},
+                "bytesRead": operation['bytesRead'],
+                "bytesWritten": operation['bytesWritten'],
+            }
+        return {"since": self.startedAt, "takenAt": time.time(), "operations": report}
+
+    def reset(self):
+        with self.lock:
+            self.operations = {}
+            self.startedAt = time.time()
+
+    def dumpTo(self, fileName):
+        FileUtils.writeAtomically(fileName, json.dumps(self.snapshot(), indent=4) + "\n")
+
+
+class MetricsDumper:
+    """Writes a Metrics snapshot to fileName every intervalMs on a daemon thread, and once more on close()."""
+
+    def __init__(self, metrics, fileName, intervalMs=10000):
+        self.metrics = metrics
+        self.fileName = fileName
+        self.interval = intervalMs / 1000
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="MetricsDumper", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.dump()
+
+    def dump(self):
+        try:
+            self.metrics.dumpTo(self.fileName)
+        except Exception as e:
+            print(f"❌ Could not write metrics to {self.fileName}: {e}")
+
+    def close(self):
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.dump()
+        atexit.unregister(self.close)
+
+
+# Every public interface method, including the optional ones with default implementations, plus the
+# storage and hashing internals that dominate a tracker's cost
+INTERFACE_METHODS = {name for name, value in vars(IFinanceTracker).items() if callable(value) and not name.startswith('_')}
+INSTRUMENTED_METHODS = sorted(INTERFACE_METHODS | {'loadData', 'hashPassword', 'checkPassword'})
+
+
+def fileSize(fileName):
+    try:
+        return os.path.getsize(fileName)
+    except (OSError, TypeError):
+        return 0
+
+
+def timed(method, name, metrics):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not metrics.enabled:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = method(self, *args, **kwargs)
+            failed = False
+            return result
+        finally:
+            metrics.record(name, time.perf_counter() - start, failed)
+    return wrapper
+
+
+def timedFileAccess(method, name, metrics, reading):
+    # loadData reads and saveData writes the whole file, so the file's size is the bytes moved by the call
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not metrics.enabled:
+            return method(self, *args, **kwargs)
+        bytesRead = fileSize(getattr(self, 'fileName', None)) if reading else 0
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = method(self, *args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            bytesWritten = 0 if reading else fileSize(getattr(self, 'fileName', None))
+            metrics.record(name, elapsed, failed, bytesRead, bytesWritten)
+    return wrapper
+
+
+def instrumented(trackerClass, metrics=None):
+    """
+    Returns a subclass of any IFinanceTracker implementation whose public operations, loadData, saveData,
+    hashPassword and checkPassword record into metrics (the subclass's .metrics, new by default).
+
+    Calls the tracker makes on itself go through the subclass too, so the saveData inside addExpense or
+    the checkPassword inside login are counted separately. Bytes are only measured for trackers that
+    load and save a whole file (those with a loadData method), as the size of tracker.fileName.
+    """
+    metrics = metrics or Metrics()
+    measuresBytes = hasattr(trackerClass, 'loadData')
+    namespace = {'metrics': metrics}
+    for name in INSTRUMENTED_METHODS:
+        method = getattr(trackerClass, name, None)
+        if method is None:
+            continue
+        if measuresBytes and name in ('loadData', 'saveData'):
+            namespace[name] = timedFileAccess(method, name, metrics, reading=name == 'loadData')
+        else:
+            namespace[name] = timed(method, name, metrics)
+    return type(f"Instrumented{trackerClass.__name__}", (trackerClass,), namespace)
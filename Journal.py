@@ -0,0 +1,41 @@
+import json
+import os
+
+
+class Journal:
+    """Append-only log of tracker mutations, one JSON record per line."""
+
+    def __init__(self, fileName, syncWrites=True):
+        self.fileName = fileName
+        self.syncWrites = syncWrites
+        self.pending = 0  # Records appended since the last checkpoint
+
+    def append(self, record):
+        line = json.dumps(record, separators=(',', ':'))
+        with open(self.fileName, 'a') as file:
+            file.write(line + "\n")
+            file.flush()
+            if self.syncWrites:
+                os.fsync(file.fileno())
+        self.pending += 1
+
+    def replay(self, afterSeq=0):
+        """Yields records with a sequence number greater than afterSeq."""
+        try:
+            with open(self.fileName, 'r') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append; nothing after it was committed
+                        break
+                    if record.get('seq', 0) > afterSeq:
+                        self.pending += 1
+                        yield record
+        except FileNotFoundError:
+            return
+
+    def truncate(self):
+        with open(self.fileName, 'w'):
+            pass
+        self.pending = 0
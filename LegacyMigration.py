@@ -0,0 +1,246 @@
+import argparse
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from FinanceTracker import FinanceTracker
+from Journal import Journal
+from PasswordHasher import PasswordHasher
+from Utilities import Validator
+
+
+def readLegacyUsers(fileName, chunkSize=1 << 20):
+    """
+    Yields (key, record, fractionRead) for each entry of the legacy file's "users" object without loading
+    the whole file; other top-level keys (currentUser, failedAttempts) are skipped.
+    """
+    decoder = json.JSONDecoder()
+    totalSize = os.path.getsize(fileName) or 1
+    with open(fileName, 'r') as file:
+        buffer = ''
+        position = 0
+        charactersRead = 0
+        exhausted = False
+
+        def readMore(size):
+            nonlocal buffer, position, charactersRead, exhausted
+            chunk = file.read(size)
+            exhausted = not chunk
+            charactersRead += len(chunk)
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def peek():
+            # Returns the next non-whitespace character, or '' at the end of the file
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in ' \t\r\n':
+                    position += 1
+                if position < len(buffer) or exhausted:
+                    return buffer[position:position + 1]
+                readMore(chunkSize)
+
+        def expect(characters):
+            nonlocal position
+            found = peek()
+            if not found or found not in characters:
+                found = found or 'end of file'
+                raise ValueError(f"Legacy file is not valid JSON: expected {characters!r}, found {found!r}")
+            position += 1
+            return found
+
+        def value():
+            # A value cut off at the end of the buffer fails to decode; read more (doubling) and retry
+            nonlocal position
+            peek()
+            size = chunkSize
+            while True:
+                try:
+                    result, end = decoder.raw_decode(buffer, position)
+                    if end < len(buffer) or exhausted:
+                        position = end
+                        return result
+                except json.JSONDecodeError:
+                    if exhausted:
+                        raise ValueError("Legacy file is not valid JSON: truncated value")
+                readMore(size)
+                size *= 2
+
+        expect('{')
+        if peek() == '}':
+            return
+        while True:
+            topKey = value()
+            expect(':')
+            if topKey != 'users':
+                value()
+            else:
+                expect('{')
+                if peek() == '}':
+                    position += 1
+                else:
+                    while True:
+                        key = value()
+                        expect(':')
+                        record = value()
+                        yield key, record, min(1.0, charactersRead / totalSize)
+                        if expect(',}') == '}':
+                            break
+            if expect(',}') == '}':
+                return
+
+
+def isBcryptHash(password):
+    return isinstance(password, str) and password.startswith(('$2a$', '$2b$', '$2y$')) and len(password) == 60
+
+
+def cleanEntries(entries, keyName, warnings, key):
+    cleaned = []
+    for entry in entries or []:
+        try:
+            cleaned.append({keyName: str(entry[keyName]), 'amount': float(entry['amount'])})
+        except (KeyError, TypeError, ValueError):
+            warnings.append((key, f"dropped malformed {keyName} entry {entry!r}"))
+    return cleaned
+
+
+def mapLegacyUser(key, record, emails, usernames, warnings):
+    """
+    Maps one legacy record to (email, user, plaintextPassword or None). Raises ValueError for records that
+    cannot be migrated. emails and usernames hold what is already taken and are updated on success.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+    email = record.get('email') or (key if Validator.isValidEmail(key) else None)
+    if not email:
+        raise ValueError("missing email")
+    if not Validator.isValidEmail(email):
+        raise ValueError(f"invalid email {email!r}")
+    if email in emails:
+        raise ValueError(f"email {email} is already registered")
+    password = record.get('password')
+    if not password or not isinstance(password, str):
+        raise ValueError("missing password")
+
+    # Old records were keyed by username; newer ones carry it explicitly. Fall back to the email,
+    # as the legacy register() did, when the preferred username is already taken
+    username = record.get('username') or (key if key != email else email.split('@')[0])
+    if username in usernames:
+        warnings.append((key, f"username {username!r} is taken; using {email!r} instead"))
+        username = email
+        if username in usernames:
+            raise ValueError(f"username {username!r} already taken")
+
+    user = {
+        'username': username,
+        'email': email,
+        'password': password if isBcryptHash(password) else None,
+        'name': record.get('name') or username,
+        'age': str(record.get('age') or ''),
+        'expenses': cleanEntries(record.get('expenses'), 'category', warnings, key),
+        'income': cleanEntries(record.get('income'), 'source', warnings, key),
+        'budget': record.get('budget', 0) if isinstance(record.get('budget', 0), (int, float)) else 0,
+    }
+    emails.add(email)
+    usernames.add(username)
+    return email, user, None if user['password'] else password
+
+
+def migrateLegacyData(legacyFileName='finance_data.json', targetFileName='NewfinanceData.json', rounds=12,
+                      workers=None, progressInterval=2.0):
+    """
+    Converts the legacy main.py data file (users keyed by username or email, plaintext or bcrypt passwords)
+    into the FinanceTracker schema and adds the users to targetFileName with a single save.
+
+    Plaintext passwords are hashed on a process pool. Each converted user is appended to
+    <targetFileName>.migration as soon as it is ready (hashes only, never plaintext), so an interrupted run
+    picks up where it stopped. Returns {'migrated', 'resumed', 'flagged': [(key, reason)], 'warnings': [...]}.
+    """
+    tracker = FinanceTracker(targetFileName, passwordHasher=PasswordHasher(rounds=rounds, workers=1))
+    progress = Journal(f"{targetFileName}.migration")
+    converted = {}  # legacy key -> (email, user)
+    for entry in progress.replay():
+        converted[entry['key']] = (entry['email'], entry['user'])
+    report = {'migrated': 0, 'resumed': len(converted), 'flagged': [], 'warnings': []}
+    emails = set(tracker.data['users']) | {email for email, _ in converted.values()}
+    usernames = set(tracker.usernameIndex) | {user['username'] for _, user in converted.values()}
+
+    hasher = PasswordHasher(rounds=rounds, workers=workers, useProcesses=True)
+    pending = {}  # future -> (key, email, user)
+    maxPending = hasher.workers * 4  # Bounds memory while keeping every worker busy
+    startedAt = lastReport = time.monotonic()
+    seq = len(converted)
+
+    def record(key, email, user):
+        nonlocal seq
+        seq += 1
+        progress.append({'seq': seq, 'key': key, 'email': email, 'user': user})
+        converted[key] = (email, user)
+
+    def collect(futures):
+        for future in futures:
+            key, email, user = pending.pop(future)
+            user['password'] = future.result()
+            record(key, email, user)
+
+    try:
+        for key, legacyRecord, fractionRead in readLegacyUsers(legacyFileName):
+            if key in converted:
+                continue
+            try:
+                email, user, plaintext = mapLegacyUser(key, legacyRecord, emails, usernames, report['warnings'])
+            except ValueError as e:
+                report['flagged'].append((key, str(e)))
+                continue
+            if plaintext is None:
+                record(key, email, user)
+            else:
+                pending[hasher.submitHash(plaintext)] = (key, email, user)
+            if len(pending) >= maxPending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            now = time.monotonic()
+            if now - lastReport >= progressInterval:
+                lastReport = now
+                rate = (len(converted) - report['resumed']) / (now - startedAt)
+                print(f"⏳ {fractionRead:.0%} read, {len(converted)} users converted ({rate:.1f}/s), "
+                      f"{len(report['flagged'])} flagged")
+        collect(list(pending))
+    finally:
+        hasher.close()
+
+    for email, user in converted.values():
+        if email in tracker.data['users']:
+            continue  # Written by an earlier run that stopped before clearing its progress file
+        tracker.data['users'][email] = user
+        tracker.prepareUser(user)
+        report['migrated'] += 1
+    tracker.rebuildUsernameIndex()
+    tracker.saveData()
+    tracker.close()
+    with contextlib.suppress(FileNotFoundError):  # Never created if no record was converted
+        os.remove(progress.fileName)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the legacy main.py data file to the FinanceTracker format")
+    parser.add_argument("legacyFile", nargs="?", default="finance_data.json")
+    parser.add_argument("targetFile", nargs="?", default="NewfinanceData.json")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, help="hashing processes (default: CPU count)")
+    args = parser.parse_args()
+
+    report = migrateLegacyData(args.legacyFile, args.targetFile, args.bcrypt_rounds, args.workers)
+    for key, warning in report['warnings']:
+        print(f"⚠️ {key}: {warning}")
+    for key, reason in report['flagged']:
+        print(f"❌ Not migrated {key}: {reason}")
+    resumed = f" ({report['resumed']} from an interrupted run)" if report['resumed'] else ""
+    print(f"✅ Migrated {report['migrated']} users{resumed} into {args.targetFile}; {len(report['flagged'])} flagged.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import bcrypt
+
+
+def hashWithCost(password, rounds):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+
+
+def verifyHash(storedHash, password):
+    return bcrypt.checkpw(password.encode(), storedHash.encode())
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a worker pool with a configurable work factor.
+
+    bcrypt releases the GIL, so the default thread pool already hashes in parallel; useProcesses=True
+    switches to a process pool. The pool size bounds how many hashes run at once, which keeps a burst
+    of logins from saturating every core.
+    """
+
+    def __init__(self, rounds=12, workers=None, useProcesses=False):
+        if not 4 <= rounds <= 31:
+            raise ValueError("bcrypt rounds must be between 4 and 31")
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count() or 1
+        executorClass = ProcessPoolExecutor if useProcesses else ThreadPoolExecutor
+        self.executor = executorClass(max_workers=self.workers)
+
+    def submitHash(self, password):
+        """Returns a future for the hash so async callers can await it without blocking."""
+        return self.executor.submit(hashWithCost, password, self.rounds)
+
+    def submitCheck(self, storedHash, password):
+        return self.executor.submit(verifyHash, storedHash, password)
+
+    def hash(self, password):
+        return self.submitHash(password).result()
+
+    def check(self, storedHash, password):
+        try:
+            return self.submitCheck(storedHash, password).result()
+        except ValueError:
+            # Not a bcrypt hash at all (e.g. a legacy plaintext value); never a match
+            return False
+
+    @staticmethod
+    def costOf(storedHash):
+        # bcrypt hashes look like $2b$12$<salt+hash>; the second field is the cost
+        try:
+            return int(storedHash.split('$')[2])
+        except (IndexError, ValueError):
+            return None
+
+    def needsRehash(self, storedHash):
+        return self.costOf(storedHash) != self.rounds
+
+    def close(self):
+        self.executor.shutdown(wait=True)
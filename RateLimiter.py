@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from BackgroundFlusher import BackgroundFlusher
+from Utilities import FileUtils
+
+
+class TokenBuckets:
+    """
+    Token buckets keyed by string, in a bounded least-recently-updated order.
+
+    A bucket holds up to capacity tokens and refills completely over windowSeconds. A bucket left alone
+    for windowSeconds is full again, which is the same as having no bucket, so idle entries are dropped
+    from the old end as new ones arrive. Past maxEntries the oldest bucket is dropped even if it is not
+    full yet, so memory stays bounded however many keys an attacker sprays.
+    """
+
+    def __init__(self, capacity, windowSeconds, maxEntries):
+        self.capacity = capacity
+        self.window = windowSeconds
+        self.refillPerSecond = capacity / windowSeconds
+        self.maxEntries = maxEntries
+        self.buckets = OrderedDict()  # key -> (tokens, updatedAt), oldest update first
+
+    def tokens(self, key, now):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return self.capacity
+        tokens, updatedAt = bucket
+        return min(self.capacity, tokens + (now - updatedAt) * self.refillPerSecond)
+
+    def retryAfter(self, key, now):
+        """Seconds until key has a token again; 0 if it has one now."""
+        tokens = self.tokens(key, now)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.refillPerSecond
+
+    def take(self, key, now):
+        self.buckets[key] = (max(0.0, self.tokens(key, now) - 1), now)
+        self.buckets.move_to_end(key)
+        self.evict(now)
+
+    def reset(self, key):
+        self.buckets.pop(key, None)
+
+    def evict(self, now):
+        while self.buckets:
+            key, (_, updatedAt) = next(iter(self.buckets.items()))
+            if len(self.buckets) <= self.maxEntries and now - updatedAt < self.window:
+                return
+            del self.buckets[key]
+
+
+class RateLimiter:
+    """
+    Throttles failed logins in memory, per identifier (username/email) and per source (e.g. client address).
+
+    Each failed attempt takes a token from both buckets; an attempt is refused while either is empty.
+    A successful login refills the identifier's bucket, like the legacy failedAttempts reset, but not the
+    source's. Checking and recording are O(1) and never touch the disk. With snapshotFile set, the
+    buckets survive restarts: they are loaded at startup and written in the background at most once per
+    snapshotIntervalMs while attempts keep failing.
+    """
+
+    def __init__(self, identifierCapacity=3, identifierWindow=60, sourceCapacity=30, sourceWindow=60,
+                 maxEntries=100000, snapshotFile=None, snapshotIntervalMs=5000):
+        self.lock = threading.Lock()
+        self.identifiers = TokenBuckets(identifierCapacity, identifierWindow, maxEntries)
+        self.sources = TokenBuckets(sourceCapacity, sourceWindow, maxEntries)
+        self.snapshotFile = snapshotFile
+        self.flusher = None
+        if snapshotFile:
+            self.loadSnapshot()
+            self.flusher = BackgroundFlusher(self.saveSnapshot, snapshotIntervalMs, maxPending=float('inf'))
+
+    def retryAfter(self, identifier, source=None):
+        """Seconds the caller must wait before trying identifier (from source) again; 0 if allowed now."""
+        now = time.time()
+        with self.lock:
+            wait = self.identifiers.retryAfter(identifier, now)
+            if source is not None:
+                wait = max(wait, self.sources.retryAfter(source, now))
+        return wait
+
+    def recordFailure(self, identifier, source=None):
+        now = time.time()
+        with self.lock:
+            self.identifiers.take(identifier, now)
+            if source is not None:
+                self.sources.take(source, now)
+        if self.flusher is not None:
+            self.flusher.markDirty()
+
+    def recordSuccess(self, identifier):
+        with self.lock:
+            self.identifiers.reset(identifier)
+
+    def snapshot(self):
+        with self.lock:
+            return {"identifiers": dict(self.identifiers.buckets), "sources": dict(self.sources.buckets)}
+
+    def saveSnapshot(self):
+        FileUtils.writeAtomically(self.snapshotFile, json.dumps(self.snapshot()))
+
+    def loadSnapshot(self):
+        try:
+            with open(self.snapshotFile, 'r') as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️ Ignoring unreadable rate limiter snapshot {self.snapshotFile}: {e}")
+            return
+        now = time.time()
+        with self.lock:
+            for buckets, name in ((self.identifiers, 'identifiers'), (self.sources, 'sources')):
+                # Oldest first, so the restored order matches the eviction order
+                entries = sorted(snapshot.get(name, {}).items(), key=lambda item: item[1][1])
+                for key, (tokens, updatedAt) in entries:
+                    buckets.buckets[key] = (tokens, updatedAt)
+                buckets.evict(now)
+
+    def close(self):
+        if self.flusher is not None:
+            self.flusher.close()
+
+    @staticmethod
+    def tooManyAttemptsMessage(wait):
+        return f"❌ Too many failed attempts. Please try again in {max(1, round(wait))} seconds."
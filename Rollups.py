@@ -0,0 +1,123 @@
+from datetime import date, datetime, timedelta
+import math
+
+
+class Rollups:
+    """
+    Pre-aggregated daily and monthly buckets of a user's entries.
+
+    Every bucket has the same shape as a user's running totals. A period report adds up whole
+    months where it can and single days only at the ragged edges, so "last 90 days" touches a
+    few dozen buckets instead of every entry. Entries without a date go to the "undated" bucket.
+
+    Monthly summaries left by history compaction only have a month, so they count towards their
+    monthly bucket and are also kept apart in "compacted", but never in a daily bucket. A period
+    that covers only part of a compacted month leaves that month's summaries out.
+    """
+
+    PERIODS = {
+        'month': "This month",
+        '90days': "Last 90 days",
+        'ytd': "Year to date",
+    }
+
+    @staticmethod
+    def emptyBucket():
+        return {"income": 0, "expenses": 0, "incomeCount": 0, "expenseCount": 0, "bySource": {}, "byCategory": {}}
+
+    @staticmethod
+    def addToBucket(bucket, kind, key, amount, count=1):
+        if kind == 'income':
+            bucket['income'] += amount
+            bucket['incomeCount'] += count
+            bucket['bySource'][key] = bucket['bySource'].get(key, 0) + amount
+        else:
+            bucket['expenses'] += amount
+            bucket['expenseCount'] += count
+            bucket['byCategory'][key] = bucket['byCategory'].get(key, 0) + amount
+
+    @staticmethod
+    def emptyRollups():
+        return {"daily": {}, "monthly": {}, "compacted": {}, "undated": Rollups.emptyBucket()}
+
+    @staticmethod
+    def add(rollups, kind, key, amount, timestamp, count=1, summary=False):
+        if timestamp is None:
+            Rollups.addToBucket(rollups['undated'], kind, key, amount, count)
+            return
+        day = datetime.fromtimestamp(timestamp).date()
+        if summary:
+            month = day.strftime('%Y-%m')
+            Rollups.addToBucket(rollups['monthly'].setdefault(month, Rollups.emptyBucket()), kind, key, amount, count)
+            Rollups.addToBucket(rollups['compacted'].setdefault(month, Rollups.emptyBucket()), kind, key, amount, count)
+            return
+        dailyBucket = rollups['daily'].setdefault(day.isoformat(), Rollups.emptyBucket())
+        monthlyBucket = rollups['monthly'].setdefault(day.strftime('%Y-%m'), Rollups.emptyBucket())
+        Rollups.addToBucket(dailyBucket, kind, key, amount, count)
+        Rollups.addToBucket(monthlyBucket, kind, key, amount, count)
+
+    @staticmethod
+    def compute(userData):
+        rollups = Rollups.emptyRollups()
+        for source, amount, timestamp, count, summary in userData['income'].records():
+            Rollups.add(rollups, 'income', source, amount, timestamp, count, summary)
+        for category, amount, timestamp, count, summary in userData['expenses'].records():
+            Rollups.add(rollups, 'expenses', category, amount, timestamp, count, summary)
+        return rollups
+
+    @staticmethod
+    def monthStart(timestamp):
+        """Epoch seconds of local midnight on the first day of timestamp's month."""
+        return datetime.fromtimestamp(timestamp).replace(day=1, hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+    @staticmethod
+    def closeTo(expected, actual):
+        """True if two buckets (or dicts of buckets) agree up to the order their amounts were added in."""
+        if isinstance(expected, dict):
+            return (isinstance(actual, dict) and expected.keys() == actual.keys()
+                    and all(Rollups.closeTo(value, actual[key]) for key, value in expected.items()))
+        return isinstance(actual, (int, float)) and math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-6)
+
+    @staticmethod
+    def periodBounds(period, today=None):
+        """Returns (start, end) dates, inclusive, for one of the named PERIODS."""
+        today = today or date.today()
+        if period == 'month':
+            return today.replace(day=1), today
+        if period == '90days':
+            return today - timedelta(days=89), today
+        if period == 'ytd':
+            return today.replace(month=1, day=1), today
+        raise ValueError(f"Unknown period: {period}")
+
+    @staticmethod
+    def combine(rollups, start, end):
+        """
+        Sums the buckets covering start..end (inclusive dates) into one bucket. Returns (bucket, left out),
+        where left out sums the compacted summaries of months the range only partly covers.
+        """
+        result, leftOut = Rollups.emptyBucket(), Rollups.emptyBucket()
+        cursor = start
+        while cursor <= end:
+            nextMonth = (cursor.replace(day=28) + timedelta(days=4)).replace(day=1)
+            if cursor.day == 1 and nextMonth - timedelta(days=1) <= end:
+                bucket = rollups['monthly'].get(cursor.strftime('%Y-%m'))
+                cursor = nextMonth
+            else:
+                if cursor == start or cursor.day == 1:
+                    compacted = rollups['compacted'].get(cursor.strftime('%Y-%m'))
+                    if compacted:
+                        Rollups.mergeInto(leftOut, compacted)
+                bucket = rollups['daily'].get(cursor.isoformat())
+                cursor += timedelta(days=1)
+            if bucket:
+                Rollups.mergeInto(result, bucket)
+        return result, leftOut
+
+    @staticmethod
+    def mergeInto(target, bucket):
+        for field in ('income', 'expenses', 'incomeCount', 'expenseCount'):
+            target[field] += bucket[field]
+        for field in ('bySource', 'byCategory'):
+            for key, amount in bucket[field].items():
+                target[field][key] = target[field].get(key, 0) + amount
@@ -0,0 +1,358 @@
+from IFinanceTracker import IFinanceTracker
+from Utilities import Validator
+from ErrorMessages import ErrorMessages
+from PasswordHasher import PasswordHasher
+from RateLimiter import RateLimiter
+from Rollups import Rollups
+import json
+import sqlite3
+import sys
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    name TEXT NOT NULL,
+    age TEXT NOT NULL,
+    budget REAL NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idxUsersEmail ON users(email);
+CREATE INDEX IF NOT EXISTS idxUsersUsername ON users(username);
+
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY,
+    userId INTEGER NOT NULL REFERENCES users(id),
+    category TEXT NOT NULL,
+    amount REAL NOT NULL,
+    date TEXT
+);
+CREATE INDEX IF NOT EXISTS idxExpensesUserCategory ON expenses(userId, category);
+
+CREATE TABLE IF NOT EXISTS income (
+    id INTEGER PRIMARY KEY,
+    userId INTEGER NOT NULL REFERENCES users(id),
+    source TEXT NOT NULL,
+    amount REAL NOT NULL,
+    date TEXT
+);
+CREATE INDEX IF NOT EXISTS idxIncomeUserSource ON income(userId, source);
+
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SQLiteFinanceTracker(IFinanceTracker):
+    """IFinanceTracker backed by a local SQLite database instead of a JSON file."""
+
+    def __init__(self, fileName='financeData.db', passwordHasher=None, rateLimiter=None):
+        self.fileName = fileName
+        self.passwordHasher = passwordHasher or PasswordHasher()
+        self.rateLimiter = rateLimiter or RateLimiter()
+        self.connection = sqlite3.connect(fileName)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self.migrateSchema()
+        self.connection.commit()
+
+    def migrateSchema(self):
+        # Databases created before entries were dated lack the date column; their rows stay undated (NULL)
+        for table in ('expenses', 'income'):
+            columns = [row['name'] for row in self.connection.execute(f"PRAGMA table_info({table})")]
+            if 'date' not in columns:
+                self.connection.execute(f"ALTER TABLE {table} ADD COLUMN date TEXT")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idxExpensesUserDate ON expenses(userId, date)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idxIncomeUserDate ON income(userId, date)")
+
+    def saveData(self):
+        # Every mutation commits its own transaction; this only flushes anything left open
+        try:
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"{ErrorMessages.getMessage('unexpectedError')}: {e}")
+
+    def close(self):
+        self.rateLimiter.close()
+        self.connection.close()
+
+    def register(self, email, password, name, age, username=None):
+        if not email or not password or not name or not age:
+            return ErrorMessages.getMessage("emptyFields")
+
+        if len(password) < 8 or not any(char.isdigit() for char in password):
+            return ErrorMessages.getMessage("weakPassword")
+
+        if self.findUser("email", email):
+            return ErrorMessages.getMessage("emailExists")
+
+        if not Validator.isValidEmail(email):
+            return ErrorMessages.getMessage("invalidEmail")
+
+        if not Validator.isValidAge(age):
+            return ErrorMessages.getMessage("invalidAge")
+
+        if not username:
+            username = email.split('@')[0]
+
+        if self.findUser("username", username):
+            return ErrorMessages.getMessage("usernameExists")
+
+        hashedPassword = self.hashPassword(password)
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO users (email, username, password, name, age, budget) VALUES (?, ?, ?, ?, ?, 0)",
+                (email, username, hashedPassword, name, str(age))
+            )
+        return ErrorMessages.getMessage("registrationSuccessful")
+
+    def login(self, identifier, password, source=None):
+        if not identifier:
+            return ErrorMessages.getMessage("loginFailed")
+
+        wait = self.rateLimiter.retryAfter(identifier, source)
+        if wait:
+            return RateLimiter.tooManyAttemptsMessage(wait)
+
+        isEmail = "@" in identifier and "." in identifier.split('@')[-1]
+        user = self.findUser("email" if isEmail else "username", identifier)
+        if user is None:
+            self.rateLimiter.recordFailure(identifier, source)
+            return ErrorMessages.getMessage("loginFailed")
+
+        if not self.checkPassword(user['password'], password):
+            self.rateLimiter.recordFailure(identifier, source)
+            return ErrorMessages.getMessage("incorrectPassword")
+        self.rateLimiter.recordSuccess(identifier)
+
+        if self.passwordHasher.needsRehash(user['password']):
+            with self.connection:
+                self.connection.execute("UPDATE users SET password = ? WHERE id = ?",
+                                        (self.hashPassword(password), user['id']))
+
+        self.setState('currentUser', user['email'])
+        return "✅ Login successful."
+
+    def logout(self):
+        self.setState('currentUser', None)
+        return "✅ Logged out successfully."
+
+    def addExpense(self, category, amount, timestamp=None):
+        try:
+            userId = self.currentUserId()
+            if amount <= 0:
+                return "❌ Expense amount must be greater than 0."
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO expenses (userId, category, amount, date) VALUES (?, ?, ?, ?)",
+                    (userId, category, amount, Validator.isoTimestamp(timestamp))
+                )
+            return f"✅ Added expense: {category} - ${amount:.2f}"
+        except Exception as e:
+            return f"❌ {str(e)}"
+
+    def addIncome(self, source, amount, timestamp=None):
+        try:
+            userId = self.currentUserId()
+            if amount <= 0:
+                return "❌ Income amount must be greater than 0."
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO income (userId, source, amount, date) VALUES (?, ?, ?, ?)",
+                    (userId, source, amount, Validator.isoTimestamp(timestamp))
+                )
+            return f"✅ Added income: {source} - ${amount:.2f}"
+        except Exception as e:
+            return f"❌ {str(e)}"
+
+    def addTransactions(self, records):
+        try:
+            userId = self.currentUserId()
+            entries = []
+            rejects = []
+            for rowNumber, record in enumerate(records, start=1):
+                try:
+                    entries.append(Validator.normalizeTransaction(record))
+                except ValueError as e:
+                    rejects.append(f"row {rowNumber}: {e}")
+            if rejects:
+                return f"❌ Batch rejected, {len(rejects)} invalid record(s): " + "; ".join(rejects[:5])
+            if not entries:
+                return "❌ No transactions to add."
+            now = Validator.isoTimestamp()
+            expenses = [(userId, entry['category'], entry['amount'], entry.get('date', now))
+                        for entry in entries if entry['type'] == 'expense']
+            income = [(userId, entry['source'], entry['amount'], entry.get('date', now))
+                      for entry in entries if entry['type'] == 'income']
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO expenses (userId, category, amount, date) VALUES (?, ?, ?, ?)", expenses)
+                self.connection.executemany(
+                    "INSERT INTO income (userId, source, amount, date) VALUES (?, ?, ?, ?)", income)
+            return f"✅ Added {len(entries)} transactions ({len(expenses)} expenses, {len(income)} income)."
+        except Exception as e:
+            return f"❌ {str(e)}"
+
+    def setBudget(self, amount):
+        try:
+            userId = self.currentUserId()
+            if amount <= 0:
+                return "❌ Budget amount must be greater than 0."
+            with self.connection:
+                self.connection.execute("UPDATE users SET budget = ? WHERE id = ?", (amount, userId))
+            return f"✅ Budget set to ${amount:.2f}"
+        except Exception as e:
+            return f"❌ {str(e)}"
+
+    def viewReport(self):
+        try:
+            userId = self.currentUserId()
+            row = self.connection.execute(
+                """
+                SELECT u.budget AS budget,
+                       (SELECT COALESCE(SUM(amount), 0) FROM income WHERE userId = u.id) AS totalIncome,
+                       (SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE userId = u.id) AS totalExpenses
+                FROM users u WHERE u.id = ?
+                """,
+                (userId,)
+            ).fetchone()
+            if row is None:
+                raise Exception("No user found.")
+            return {
+                "Total Income": row['totalIncome'],
+                "Total Expenses": row['totalExpenses'],
+                "Budget": row['budget'],
+                "Remaining": row['budget'] - row['totalExpenses']
+            }
+        except Exception as e:
+            print(f"❌ {e}")
+            return None
+
+    def viewPeriodReport(self, period='month', start=None, end=None):
+        try:
+            userId = self.currentUserId()
+            if start is None or end is None:
+                start, end = Rollups.periodBounds(period)
+                label = Rollups.PERIODS[period]
+            else:
+                label = "Custom period"
+            # ISO strings sort chronologically, so the (userId, date) indexes serve the range directly
+            bounds = (userId, start.isoformat(), end.isoformat() + "T23:59:59")
+            byCategory = {row['category']: row['total'] for row in self.connection.execute(
+                "SELECT category, SUM(amount) AS total FROM expenses WHERE userId = ? AND date BETWEEN ? AND ? "
+                "GROUP BY category", bounds)}
+            bySource = {row['source']: row['total'] for row in self.connection.execute(
+                "SELECT source, SUM(amount) AS total FROM income WHERE userId = ? AND date BETWEEN ? AND ? "
+                "GROUP BY source", bounds)}
+            undated = self.connection.execute(
+                "SELECT (SELECT COUNT(*) FROM expenses WHERE userId = ? AND date IS NULL) + "
+                "(SELECT COUNT(*) FROM income WHERE userId = ? AND date IS NULL)", (userId, userId)).fetchone()[0]
+            totalIncome = sum(bySource.values())
+            totalExpenses = sum(byCategory.values())
+            return {
+                "Period": f"{label} ({start.isoformat()} to {end.isoformat()})",
+                "Total Income": totalIncome,
+                "Total Expenses": totalExpenses,
+                "Net": totalIncome - totalExpenses,
+                "Expenses by Category": byCategory,
+                "Income by Source": bySource,
+                "Undated Entries": undated
+            }
+        except Exception as e:
+            print(f"❌ {e}")
+            return None
+
+    def viewAnalytics(self, topN=5):
+        try:
+            userId = self.currentUserId()
+            from Analytics import Analytics  # NumPy is only needed for analytics
+            expenses = Analytics.fromRows(self.connection.execute(
+                "SELECT category, amount FROM expenses WHERE userId = ?", (userId,)))
+            income = Analytics.fromRows(self.connection.execute(
+                "SELECT source, amount FROM income WHERE userId = ?", (userId,)))
+            return Analytics.summarize(*expenses, *income, topN)
+        except Exception as e:
+            print(f"❌ {e}")
+            return None
+
+    def checkLogin(self):
+        if self.getCurrentUser() is None:
+            raise Exception(ErrorMessages.getMessage("notLoggedIn"))
+
+    def currentUserId(self):
+        self.checkLogin()
+        user = self.findUser("email", self.getCurrentUser())
+        if user is None:
+            raise Exception("No user found.")
+        return user['id']
+
+    def findUser(self, column, value):
+        # column is always one of the two indexed lookup columns, never user input
+        return self.connection.execute(
+            f"SELECT * FROM users WHERE {column} = ? ORDER BY id LIMIT 1", (value,)
+        ).fetchone()
+
+    def userExists(self, identifier):
+        return self.findUser("email", identifier) is not None or self.findUser("username", identifier) is not None
+
+    def hashPassword(self, password):
+        """Hashes the password using bcrypt on the hasher's worker pool."""
+        return self.passwordHasher.hash(password)
+
+    def checkPassword(self, storedHash, password):
+        return self.passwordHasher.check(storedHash, password)
+
+    def getState(self, key):
+        row = self.connection.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def setState(self, key, value):
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
+
+    def getCurrentUser(self):
+        return self.getState('currentUser')
+
+
+def convertJsonToSqlite(jsonFileName='NewfinanceData.json', dbFileName='financeData.db'):
+    """One-shot import of a NewfinanceData.json file into a SQLite database."""
+    with open(jsonFileName, 'r') as file:
+        data = json.load(file)
+
+    tracker = SQLiteFinanceTracker(dbFileName)
+    imported = 0
+    with tracker.connection:
+        for email, user in data.get('users', {}).items():
+            if tracker.findUser("email", email):
+                print(f"⚠️ Skipping {email}: already present in {dbFileName}.")
+                continue
+            cursor = tracker.connection.execute(
+                "INSERT INTO users (email, username, password, name, age, budget) VALUES (?, ?, ?, ?, ?, ?)",
+                (email, user.get('username') or email.split('@')[0], user['password'],
+                 user.get('name', ''), str(user.get('age', '')), user.get('budget', 0))
+            )
+            userId = cursor.lastrowid
+            tracker.connection.executemany(
+                "INSERT INTO expenses (userId, category, amount, date) VALUES (?, ?, ?, ?)",
+                ((userId, item['category'], item['amount'], item.get('date')) for item in user.get('expenses', []))
+            )
+            tracker.connection.executemany(
+                "INSERT INTO income (userId, source, amount, date) VALUES (?, ?, ?, ?)",
+                ((userId, item['source'], item['amount'], item.get('date')) for item in user.get('income', []))
+            )
+            imported += 1
+        tracker.connection.execute(
+            "INSERT OR REPLACE INTO state (key, value) VALUES ('currentUser', ?)", (data.get('currentUser'),)
+        )
+    tracker.close()
+    print(f"✅ Imported {imported} users from {jsonFileName} into {dbFileName}.")
+    return imported
+
+
+if __name__ == "__main__":
+    convertJsonToSqlite(*sys.argv[1:3])
@@ -0,0 +1,175 @@
+from collections import OrderedDict
+import contextlib
+from datetime import datetime
+import hashlib
+import json
+import os
+import sys
+
+from FinanceTracker import FinanceTracker
+from TransactionStore import StringTable
+from Utilities import FileUtils
+
+
+# Fields kept in the small index file; everything else about a user lives in that user's shard
+PROFILE_FIELDS = ('username', 'email', 'password', 'name', 'age')
+
+
+class ShardedFinanceTracker(FinanceTracker):
+    """
+    FinanceTracker that stores each user's data in its own file.
+
+    dataDir/index.json holds only the profile fields needed for login and uniqueness checks,
+    dataDir/session.json holds currentUser, and dataDir/users/<hash>.json holds one user's
+    transactions, budget and totals. Shards are loaded the first time a user is touched and only
+    the affected shard is rewritten on a mutation. At most maxLoadedShards are kept in memory;
+    the least recently used is dropped first (shards are written through, so dropping is free).
+    """
+
+    def __init__(self, dataDir='financeData', maxLoadedShards=128, passwordHasher=None, rateLimiter=None,
+                 alertNotifier=None):
+        self.dataDir = dataDir
+        self.maxLoadedShards = maxLoadedShards
+        self.loadedShards = OrderedDict()  # email -> None, in least-recently-used order
+        os.makedirs(os.path.join(dataDir, 'users'), exist_ok=True)
+        super().__init__(fileName=os.path.join(dataDir, 'index.json'), passwordHasher=passwordHasher,
+                         rateLimiter=rateLimiter, alertNotifier=alertNotifier)
+
+    def shardFileName(self, email):
+        # Hash the email so any address maps to a safe, fixed-length file name
+        return os.path.join(self.dataDir, 'users', hashlib.sha1(email.encode()).hexdigest() + '.json')
+
+    def sessionFileName(self):
+        return os.path.join(self.dataDir, 'session.json')
+
+    def loadData(self):
+        self.stringTable = StringTable()
+        self.loadedShards.clear()
+        try:
+            with open(self.fileName, 'r') as file:
+                users = json.load(file).get('users', {})
+        except FileNotFoundError:
+            print("⚠️ Data index not found. Initializing a new data directory...")
+            users = {}
+        except json.JSONDecodeError:
+            print("⚠️ The data index appears to be corrupted. A new index will be initialized.")
+            backupFileName = f"{self.fileName}.{datetime.now().strftime('%Y%m%d%H%M%S')}.bak"
+            os.rename(self.fileName, backupFileName)
+            print(f"⚠️ Corrupted index backed up as {backupFileName}.")
+            users = {}
+        try:
+            with open(self.sessionFileName(), 'r') as file:
+                currentUser = json.load(file).get('currentUser')
+        except (FileNotFoundError, json.JSONDecodeError):
+            currentUser = None
+        self.data = {"users": users, "currentUser": currentUser}
+        self.rebuildUsernameIndex()
+        if not os.path.exists(self.fileName):
+            self.saveIndex()
+
+    def getUser(self, email):
+        user = self.data['users'][email]
+        if email in self.loadedShards:
+            self.loadedShards.move_to_end(email)
+            return user
+        try:
+            with open(self.shardFileName(email), 'r') as file:
+                user.update(json.load(file))
+        except FileNotFoundError:
+            user.update({'expenses': [], 'income': [], 'budget': 0})
+        self.prepareUser(user)
+        self.markLoaded(email)
+        return user
+
+    def markLoaded(self, email):
+        self.loadedShards[email] = None
+        self.loadedShards.move_to_end(email)
+        while len(self.loadedShards) > self.maxLoadedShards:
+            evictedEmail, _ = self.loadedShards.popitem(last=False)
+            self.evictShard(evictedEmail)
+
+    def evictShard(self, email):
+        user = self.data['users'].get(email)
+        if user is None:
+            return
+        for field in [field for field in user if field not in PROFILE_FIELDS]:
+            del user[field]
+
+    def saveIndex(self):
+        index = {email: {field: user[field] for field in PROFILE_FIELDS if field in user}
+                 for email, user in self.data['users'].items()}
+        self.writeJson(self.fileName, {"users": index})
+
+    def saveSession(self):
+        self.writeJson(self.sessionFileName(), {"currentUser": self.data['currentUser']})
+
+    def saveShard(self, email):
+        user = self.data['users'][email]
+        self.writeJson(self.shardFileName(email), {field: value for field, value in self.storedFields(user).items()
+                                                   if field not in PROFILE_FIELDS})
+
+    def writeJson(self, fileName, content):
+        FileUtils.writeAtomically(fileName, json.dumps(content, indent=4, default=self.toJson))
+
+    def saveData(self):
+        try:
+            self.saveIndex()
+            self.saveSession()
+            for email in self.loadedShards:
+                self.saveShard(email)
+        except (PermissionError, IOError) as e:
+            print(f"❌ Permission denied. Unable to save data: {e}")
+        except Exception as e:
+            print(f"❌ An unexpected error occurred: {e}")
+
+    def batch(self):
+        # Shards are written through and may be evicted mid-batch, so changes cannot be held back
+        return contextlib.nullcontext(self)
+
+    def persist(self, record):
+        op = record['op']
+        try:
+            if op in ('login', 'logout'):
+                self.saveSession()
+            elif op == 'register':
+                email = record['user']['email']
+                self.markLoaded(email)
+                self.saveShard(email)
+                self.saveIndex()
+            elif op == 'updatePassword':
+                self.saveIndex()
+            else:
+                self.saveShard(record['email'])
+        except (PermissionError, IOError) as e:
+            print(f"❌ Permission denied. Unable to save data: {e}")
+
+    def verifyTotals(self, email=None):
+        emails = [email] if email is not None else list(self.data['users'])
+        repaired = 0
+        for userEmail in emails:
+            if self.repairAggregates(userEmail, self.getUser(userEmail)):
+                self.saveShard(userEmail)
+                repaired += 1
+        return repaired
+
+
+def splitIntoShards(jsonFileName='NewfinanceData.json', dataDir='financeData'):
+    """One-shot conversion of a NewfinanceData.json file into the sharded directory layout."""
+    with open(jsonFileName, 'r') as file:
+        data = json.load(file)
+
+    os.makedirs(os.path.join(dataDir, 'users'), exist_ok=True)
+    tracker = ShardedFinanceTracker(dataDir, maxLoadedShards=1)
+    for email, user in data.get('users', {}).items():
+        tracker.data['users'][email] = user
+        tracker.prepareUser(user)
+        tracker.saveShard(email)
+        tracker.evictShard(email)
+    tracker.data['currentUser'] = data.get('currentUser')
+    tracker.saveIndex()
+    tracker.saveSession()
+    print(f"✅ Split {len(data.get('users', {}))} users from {jsonFileName} into {dataDir}.")
+
+
+if __name__ == "__main__":
+    splitIntoShards(*sys.argv[1:3])
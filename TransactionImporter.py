@@ -0,0 +1,87 @@
+import csv
+import json
+import os
+import sys
+from Utilities import Validator
+from ErrorMessages import ErrorMessages
+
+
+def readRecords(fileName):
+    """Yields (rowNumber, record) one row at a time from a .csv or .jsonl file."""
+    extension = os.path.splitext(fileName)[1].lower()
+    with open(fileName, 'r', newline='') as file:
+        if extension == '.csv':
+            # Header row is 1, so data rows start at 2 to match what a spreadsheet shows
+            for rowNumber, row in enumerate(csv.DictReader(file), start=2):
+                yield rowNumber, row
+        elif extension in ('.jsonl', '.ndjson'):
+            for rowNumber, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield rowNumber, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield rowNumber, {'_error': f"invalid JSON: {e.msg}"}
+        else:
+            raise ValueError(f"Unsupported import format: {extension or fileName}")
+
+
+def importTransactions(tracker, fileName, batchSize=1000):
+    """
+    Streams expense/income records from a CSV or JSONL file into the logged-in user's account.
+
+    Valid rows are sent to tracker.addTransactions in batches of batchSize, so only one batch is held
+    in memory and the tracker persists once per batch. Invalid rows are skipped and reported.
+    CSV files need a header with type, category or source, and amount columns.
+    Returns {'imported': int, 'rejected': [(rowNumber, reason), ...]}.
+    """
+    if tracker.getCurrentUser() is None:
+        raise Exception(ErrorMessages.getMessage("notLoggedIn"))
+
+    result = {'imported': 0, 'rejected': []}
+    batch = []
+    batchRows = []
+
+    def flush():
+        message = tracker.addTransactions(batch)
+        if not message.startswith("✅"):
+            # Rows were already validated, so this is a storage failure; report the whole batch
+            result['rejected'].extend((rowNumber, message) for rowNumber in batchRows)
+        else:
+            result['imported'] += len(batch)
+        batch.clear()
+        batchRows.clear()
+
+    for rowNumber, record in readRecords(fileName):
+        if '_error' in record:
+            result['rejected'].append((rowNumber, record['_error']))
+            continue
+        try:
+            batch.append(Validator.normalizeTransaction(record))
+            batchRows.append(rowNumber)
+        except ValueError as e:
+            result['rejected'].append((rowNumber, str(e)))
+            continue
+        if len(batch) >= batchSize:
+            flush()
+    if batch:
+        flush()
+    return result
+
+
+if __name__ == "__main__":
+    from FinanceTracker import FinanceTracker
+
+    if len(sys.argv) != 4:
+        print("Usage: python TransactionImporter.py <file.csv|file.jsonl> <username or email> <password>")
+        sys.exit(1)
+    importFile, identifier, password = sys.argv[1:4]
+    financeTracker = FinanceTracker()
+    loginMessage = financeTracker.login(identifier, password)
+    if "✅" not in loginMessage:
+        print(loginMessage)
+        sys.exit(1)
+    summary = importTransactions(financeTracker, importFile)
+    print(f"✅ Imported {summary['imported']} transactions.")
+    for badRow, reason in summary['rejected']:
+        print(f"❌ Row {badRow}: {reason}")
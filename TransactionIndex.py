@@ -0,0 +1,142 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain
+import math
+import re
+
+
+class SortedIndex:
+    """Entry positions ordered by a numeric key (amount or timestamp), for range lookups by binary search."""
+
+    def __init__(self):
+        self.keys = array('d')
+        self.positions = array('I')
+
+    @classmethod
+    def build(cls, keys, exclude=()):
+        index = cls()
+        order = sorted((position for position, key in enumerate(keys)
+                        if not math.isnan(key) and position not in exclude), key=keys.__getitem__)
+        index.keys = array('d', (keys[position] for position in order))
+        index.positions = array('I', order)
+        return index
+
+    def add(self, key, position):
+        at = bisect_right(self.keys, key)
+        self.keys.insert(at, key)
+        self.positions.insert(at, position)
+
+    def bounds(self, low=None, high=None):
+        start = 0 if low is None else bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return start, max(start, end)
+
+    def range(self, low=None, high=None):
+        start, end = self.bounds(low, high)
+        return self.positions[start:end]
+
+
+class TransactionIndex:
+    """
+    Search indexes over one TransactionColumns. Built the first time the entries are searched and then
+    kept up to date entry by entry as TransactionColumns.add() appends.
+
+    Names are split into lowercase word tokens. Each token maps to the string codes whose names contain it
+    and each code to its entry positions, so a name search only touches the matching entries; a sorted list
+    of the distinct tokens answers prefix searches by binary search. Amounts and timestamps are held in
+    sorted indexes for range searches. Undated entries never match a date range, and summary entries left by
+    history compaction never match an amount range, since their amount is a total rather than one transaction.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.postings = {}  # string code -> array('I') of entry positions, in entry order
+        self.tokenCodes = {}  # token -> set of string codes whose names contain it
+        self.sortedTokens = []
+        for position, code in enumerate(columns.codes):
+            self.addPosting(code, position)
+        self.summaries = {position for position, _ in columns.summaries()}  # New entries are never summaries
+        self.amounts = SortedIndex.build(columns.amounts, self.summaries)
+        self.timestamps = SortedIndex.build(columns.timestamps)
+
+    @staticmethod
+    def tokenize(text):
+        return re.findall(r'\w+', text.lower())
+
+    def addPosting(self, code, position):
+        postings = self.postings.get(code)
+        if postings is None:
+            postings = self.postings[code] = array('I')
+            for token in self.tokenize(self.columns.stringTable.lookup(code)):
+                codes = self.tokenCodes.get(token)
+                if codes is None:
+                    codes = self.tokenCodes[token] = set()
+                    insort(self.sortedTokens, token)
+                codes.add(code)
+        postings.append(position)
+
+    def add(self, position):
+        self.addPosting(self.columns.codes[position], position)
+        self.amounts.add(self.columns.amounts[position], position)
+        timestamp = self.columns.timestamps[position]
+        if not math.isnan(timestamp):
+            self.timestamps.add(timestamp, position)
+
+    def codesWithPrefix(self, prefix):
+        # Every word of the prefix must start a word of the name, so "car rep" finds "Car repair";
+        # a prefix without any words matches nothing
+        result = None
+        for queryToken in self.tokenize(prefix):
+            codes = set()
+            at = bisect_left(self.sortedTokens, queryToken)
+            while at < len(self.sortedTokens) and self.sortedTokens[at].startswith(queryToken):
+                codes |= self.tokenCodes[self.sortedTokens[at]]
+                at += 1
+            result = codes if result is None else result & codes
+        return set() if result is None else result
+
+    def codesContaining(self, text):
+        # Substrings can start mid-token, so scan the distinct names rather than the entries
+        text = text.lower()
+        lookup = self.columns.stringTable.lookup
+        return {code for code in self.postings if text in lookup(code).lower()}
+
+    def search(self, prefix=None, contains=None, minAmount=None, maxAmount=None, start=None, end=None):
+        """
+        Returns the positions of the entries matching every given condition, in entry order, as an array('I')
+        (a range if no condition is given). start and end are epoch seconds, inclusive.
+        """
+        codes = self.codesWithPrefix(prefix) if prefix else None
+        if contains:
+            containing = self.codesContaining(contains)
+            codes = containing if codes is None else codes & containing
+        hasAmount = minAmount is not None or maxAmount is not None
+        hasDate = start is not None or end is not None
+
+        # Walk the most selective index and check the other conditions against the columns directly
+        candidates = []
+        if codes is not None:
+            candidates.append((sum(len(self.postings[code]) for code in codes),
+                               lambda: chain.from_iterable(self.postings[code] for code in codes)))
+        if hasAmount:
+            first, last = self.amounts.bounds(minAmount, maxAmount)
+            candidates.append((last - first, lambda: self.amounts.range(minAmount, maxAmount)))
+        if hasDate:
+            first, last = self.timestamps.bounds(start, end)
+            candidates.append((last - first, lambda: self.timestamps.range(start, end)))
+        columns = self.columns
+        if not candidates:
+            return range(len(columns))
+        _, driver = min(candidates, key=lambda candidate: candidate[0])
+
+        # Check the driver's positions against the other conditions and sort just the matches, so a query
+        # costs about as much as the entries it touches however many entries there are
+        low = -math.inf if minAmount is None else minAmount
+        high = math.inf if maxAmount is None else maxAmount
+        earliest = -math.inf if start is None else start
+        latest = math.inf if end is None else end
+        return array('I', sorted(position for position in driver()
+                                 if (codes is None or columns.codes[position] in codes)
+                                 and (not hasAmount or (low <= columns.amounts[position] <= high
+                                                        and position not in self.summaries))
+                                 and (not hasDate or earliest <= columns.timestamps[position] <= latest)))
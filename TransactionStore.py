@@ -0,0 +1,207 @@
+from array import array
+from datetime import datetime
+import math
+
+from TransactionIndex import TransactionIndex
+
+
+class StringTable:
+    """Interns category/source strings so each distinct name is stored once and referenced by an integer code."""
+
+    def __init__(self):
+        self.strings = []
+        self.codes = {}
+
+    def intern(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self.codes[value] = code
+        return code
+
+    def lookup(self, code):
+        return self.strings[code]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class TransactionColumns:
+    """
+    Columnar storage for one user's expense or income entries.
+
+    Amounts live in an array('d'), names in an array('I') of string table codes and timestamps in an
+    array('d') of epoch seconds (NaN for entries recorded before dates existed), so an entry costs
+    20 bytes instead of a dict per entry. It still behaves like the old list of dicts for reading and
+    appending; the dicts are only built on demand and when the data is saved as JSON.
+    """
+
+    def __init__(self, keyName, stringTable):
+        self.keyName = keyName  # 'category' for expenses, 'source' for income
+        self.stringTable = stringTable
+        self.amounts = array('d')
+        self.codes = array('I')
+        self.timestamps = array('d')
+        self.extras = {}  # Sparse: index -> fields beyond keyName/amount, kept so nothing is lost on save
+        self.index = None  # TransactionIndex, built by searchIndex() on the first search
+
+    @classmethod
+    def fromList(cls, entries, keyName, stringTable):
+        # Loading a file goes through here for every entry, so the columns are filled in one pass with
+        # local lookups rather than an append() call per entry
+        columns = cls(keyName, stringTable)
+        intern, fromisoformat = stringTable.intern, datetime.fromisoformat
+        codes, amounts, timestamps = [], [], []
+        for index, entry in enumerate(entries):
+            codes.append(intern(entry[keyName]))
+            amounts.append(entry['amount'])
+            date = entry.get('date')
+            timestamps.append(fromisoformat(date).timestamp() if date else math.nan)
+            if len(entry) > (3 if 'date' in entry else 2):
+                columns.extras[index] = columns.extraFields(entry)
+        columns.codes, columns.amounts, columns.timestamps = array('I', codes), array('d', amounts), array('d', timestamps)
+        return columns
+
+    def add(self, key, amount, timestamp=None):
+        self.codes.append(self.stringTable.intern(key))
+        self.amounts.append(amount)
+        self.timestamps.append(math.nan if timestamp is None else timestamp)
+        if self.index is not None:
+            self.index.add(len(self.amounts) - 1)
+
+    def append(self, entry):
+        date = entry.get('date')
+        self.add(entry[self.keyName], entry['amount'], datetime.fromisoformat(date).timestamp() if date else None)
+        # Entries almost always hold just the name, amount and date; only build extras when there is more
+        if len(entry) > (3 if 'date' in entry else 2):
+            self.extras[len(self.amounts) - 1] = self.extraFields(entry)
+
+    def extraFields(self, entry):
+        return {field: value for field, value in entry.items() if field not in (self.keyName, 'amount', 'date')}
+
+    def searchIndex(self):
+        if self.index is None:
+            self.index = TransactionIndex(self)
+        return self.index
+
+    def pairs(self):
+        """Yields (name, amount) tuples without building dicts."""
+        lookup = self.stringTable.lookup
+        for code, amount in zip(self.codes, self.amounts):
+            yield lookup(code), amount
+
+    def triples(self):
+        """Yields (name, amount, timestamp or None) tuples without building dicts."""
+        lookup = self.stringTable.lookup
+        for code, amount, timestamp in zip(self.codes, self.amounts, self.timestamps):
+            yield lookup(code), amount, None if math.isnan(timestamp) else timestamp
+
+    def entryCount(self, index):
+        # Summary entries left by fold() stand for 'count' original entries
+        extra = self.extras.get(index)
+        return extra.get('count', 1) if extra else 1
+
+    def isSummary(self, index):
+        extra = self.extras.get(index)
+        return bool(extra and extra.get('summary'))
+
+    def summaries(self):
+        """Returns (position, entry count) for each summary entry, in position order."""
+        return sorted((index, extra.get('count', 1)) for index, extra in self.extras.items() if extra.get('summary'))
+
+    def records(self):
+        """
+        Yields (name, amount, timestamp or None, entry count, is summary) tuples; the count is 1 except for
+        summaries.
+        """
+        lookup = self.stringTable.lookup
+        for index, (code, amount, timestamp) in enumerate(zip(self.codes, self.amounts, self.timestamps)):
+            yield (lookup(code), amount, None if math.isnan(timestamp) else timestamp, self.entryCount(index),
+                   self.isSummary(index))
+
+    def isFoldable(self, index, before):
+        timestamp = self.timestamps[index]
+        return not math.isnan(timestamp) and timestamp < before
+
+    def foldGroups(self, before, periodStart):
+        """
+        Groups the entries dated before the `before` timestamp by (period start, code). Only groups of two or
+        more entries are returned: a lone entry is already as small as a summary of it would be.
+        """
+        groups = {}
+        for index in range(len(self.amounts)):
+            if self.isFoldable(index, before):
+                groups.setdefault((periodStart(self.timestamps[index]), self.codes[index]), []).append(index)
+        return {key: indexes for key, indexes in groups.items() if len(indexes) > 1}
+
+    def foldedEntries(self, before, periodStart):
+        """Yields, as dicts, the original (non-summary) entries that fold() with the same arguments would replace."""
+        for indexes in self.foldGroups(before, periodStart).values():
+            for index in indexes:
+                if not self.isSummary(index):
+                    yield self[index]
+
+    def fold(self, before, periodStart):
+        """
+        Replaces entries dated before the `before` timestamp with one summary entry per period and name,
+        which keeps their total amount and entry count. periodStart maps a timestamp to the start of its
+        period. Undated entries, and entries alone in their period and name, are kept as they are. Folding
+        again with the same arguments changes nothing.
+        """
+        groups = self.foldGroups(before, periodStart)
+        if not groups:
+            return
+        folded = {index for indexes in groups.values() for index in indexes}
+        kept = [index for index in range(len(self.amounts)) if index not in folded]
+        amounts, codes, timestamps, extras = array('d'), array('I'), array('d'), {}
+        for (timestamp, code), indexes in sorted(groups.items()):
+            amount = 0.0
+            for index in indexes:
+                amount += self.amounts[index]
+            extras[len(amounts)] = {'count': sum(self.entryCount(index) for index in indexes), 'summary': True}
+            amounts.append(amount)
+            codes.append(code)
+            timestamps.append(timestamp)
+        for index in kept:
+            if index in self.extras:
+                extras[len(amounts)] = self.extras[index]
+            amounts.append(self.amounts[index])
+            codes.append(self.codes[index])
+            timestamps.append(self.timestamps[index])
+        self.amounts, self.codes, self.timestamps, self.extras = amounts, codes, timestamps, extras
+        self.index = None  # Positions have moved; rebuilt on the next search
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.amounts)
+        if not 0 <= index < len(self.amounts):
+            raise IndexError("transaction index out of range")
+        entry = {self.keyName: self.stringTable.lookup(self.codes[index]), 'amount': self.amounts[index]}
+        if not math.isnan(self.timestamps[index]):
+            entry['date'] = datetime.fromtimestamp(self.timestamps[index]).isoformat(timespec='seconds')
+        extra = self.extras.get(index)
+        if extra:
+            entry.update(extra)
+        return entry
+
+    def __iter__(self):
+        for index in range(len(self.amounts)):
+            yield self[index]
+
+    def toList(self):
+        # Saving as JSON builds every entry, so this avoids the per-entry bounds checks of __getitem__
+        strings, keyName, extras = self.stringTable.strings, self.keyName, self.extras
+        fromtimestamp = datetime.fromtimestamp
+        entries = []
+        for index, (code, amount, timestamp) in enumerate(zip(self.codes, self.amounts, self.timestamps)):
+            entry = {keyName: strings[code], 'amount': amount}
+            if not math.isnan(timestamp):
+                entry['date'] = fromtimestamp(timestamp).isoformat(timespec='seconds')
+            if index in extras:
+                entry.update(extras[index])
+            entries.append(entry)
+        return entries
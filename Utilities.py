@@ -1,3 +1,18 @@
+import os
+import tempfile
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# The umask can only be read by setting it, so read it once at import rather than on every save, which could
+# briefly clear it while another thread creates a file
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
 class Validator:
     @staticmethod
     def isValidEmail(email: str) -> bool:
@@ -11,7 +26,9 @@ class Validator:
             return False
 
     @staticmethod
-    def isUniqueUsername(username: str, users: dict) -> bool:
+    def isUniqueUsername(username: str, users: dict, usernameIndex: dict = None) -> bool:
+        if usernameIndex is not None:
+            return username not in usernameIndex
         return not any(user['username'] == username for user in users.values())
 
     @staticmethod
@@ -20,4 +37,89 @@ class Validator:
             ageInt = int(age)
             return 18 <= ageInt <= 100
         except ValueError:
-            return False
\ No newline at end of file
+            return False
+
+    @staticmethod
+    def normalizeTransaction(record: dict) -> dict:
+        """
+        Turns a raw import record into {'type', 'category' or 'source', 'amount'} plus 'date' if one is given.
+        The name may be given as 'category' or 'source' for either type. Raises ValueError if it is invalid.
+        """
+        kind = str(record.get('type', '')).strip().lower()
+        if kind not in ('expense', 'income'):
+            raise ValueError(f"type must be 'expense' or 'income', got {record.get('type')!r}")
+        name = record.get('category') or record.get('source')
+        if not name or not str(name).strip():
+            raise ValueError("category/source cannot be empty")
+        try:
+            amount = float(record.get('amount'))
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid amount {record.get('amount')!r}")
+        if not amount > 0 or amount == float('inf'):
+            raise ValueError("amount must be greater than 0")
+        keyName = 'category' if kind == 'expense' else 'source'
+        transaction = {'type': kind, keyName: str(name).strip(), 'amount': amount}
+        if record.get('date'):
+            try:
+                transaction['date'] = Validator.isoTimestamp(datetime.fromisoformat(str(record['date']).strip()))
+            except ValueError:
+                raise ValueError(f"invalid date {record.get('date')!r}, expected YYYY-MM-DD")
+        return transaction
+
+    @staticmethod
+    def isoTimestamp(timestamp: datetime = None) -> str:
+        """Formats a datetime (default: now) the way entries store it, e.g. 2024-05-01T09:30:00."""
+        return (timestamp or datetime.now()).isoformat(timespec='seconds')
+
+
+class FileUtils:
+    @staticmethod
+    def writeAtomically(fileName: str, text) -> None:
+        """Writes text (str or bytes) to a temp file beside fileName and renames it into place, so readers never see a partial file."""
+        directory = os.path.dirname(os.path.abspath(fileName))
+        fileDescriptor, tempName = tempfile.mkstemp(prefix=os.path.basename(fileName) + '.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fileDescriptor, 'wb' if isinstance(text, bytes) else 'w') as file:
+                # mkstemp creates the file owner-only; keep the mode the file had, or the usual one for a new file
+                try:
+                    mode = os.stat(fileName).st_mode & 0o7777
+                except FileNotFoundError:
+                    mode = 0o666 & ~UMASK
+                os.chmod(tempName, mode)
+                file.write(text)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tempName, fileName)
+        except BaseException:
+            if os.path.exists(tempName):
+                os.remove(tempName)
+            raise
+
+
+class FileLock:
+    """
+    Exclusive advisory lock held through fileName (created if missing), shared by every process that uses it.
+    Re-entrant within a process, so pair it with a threading lock when several threads use the same instance.
+    """
+
+    def __init__(self, fileName: str):
+        if fcntl is None:
+            raise OSError("File locking needs fcntl, which is not available on this platform.")
+        self.fileName = fileName
+        self.file = None
+        self.depth = 0
+
+    def __enter__(self):
+        if self.depth == 0:
+            self.file = open(self.fileName, 'a')
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        self.depth += 1
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.depth -= 1
+        if self.depth == 0:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            self.file.close()
+            self.file = None
+        return False
@@ -0,0 +1,90 @@
+"""
+Stress check for shared mode: several processes add expenses to one data file at the same time, then the
+file is reloaded and every entry must be present exactly once.
+
+Run from the repository root:
+    python -m benchmarks.ConcurrencyStress --processes 8 --expenses 200
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from FinanceTracker import FinanceTracker
+from PasswordHasher import PasswordHasher
+from benchmarks.DatasetGenerator import BENCHMARK_PASSWORD, BENCHMARK_ROUNDS
+
+
+EMAIL = "stress@example.com"
+
+
+def worker(fileName, workerIndex, expenseCount, writeBehind, startEvent):
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker = FinanceTracker(fileName, shared=True, writeBehind=writeBehind,
+                                 passwordHasher=PasswordHasher(rounds=BENCHMARK_ROUNDS, workers=1))
+        startEvent.wait()
+        for index in range(expenseCount):
+            message = tracker.addExpense(f"worker{workerIndex}-{index}", 1.0, email=EMAIL)
+            if not message.startswith("✅"):
+                raise RuntimeError(message)
+        tracker.close()
+
+
+def runStress(directory, processCount, expenseCount, writeBehind):
+    fileName = os.path.join(directory, "shared.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker = FinanceTracker(fileName, shared=True, passwordHasher=PasswordHasher(rounds=BENCHMARK_ROUNDS))
+        tracker.register(EMAIL, BENCHMARK_PASSWORD, "Stress Test", 30, "stress")
+        tracker.close()
+
+    startEvent = multiprocessing.Event()
+    workers = [multiprocessing.Process(target=worker, args=(fileName, index, expenseCount, writeBehind, startEvent))
+               for index in range(processCount)]
+    for process in workers:
+        process.start()
+    start = time.perf_counter()
+    startEvent.set()
+    for process in workers:
+        process.join()
+    elapsed = time.perf_counter() - start
+    failedWorkers = [process.exitcode for process in workers if process.exitcode != 0]
+    if failedWorkers:
+        raise AssertionError(f"{len(failedWorkers)} worker processes failed")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker = FinanceTracker(fileName, passwordHasher=PasswordHasher(rounds=BENCHMARK_ROUNDS))
+    user = tracker.getUser(EMAIL)
+    categories = [category for category, _ in user['expenses'].pairs()]
+    expected = {f"worker{workerIndex}-{index}" for workerIndex in range(processCount) for index in range(expenseCount)}
+    missing = expected - set(categories)
+    duplicates = len(categories) - len(set(categories))
+    if missing or duplicates:
+        raise AssertionError(f"{len(missing)} expenses lost and {duplicates} duplicated")
+    if user['totals']['expenseCount'] != len(expected) or user['totals']['expenses'] != float(len(expected)):
+        raise AssertionError(f"running totals disagree with the entries: {user['totals']}")
+    return len(expected), elapsed, tracker.data['version']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that concurrent processes sharing a data file lose nothing")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--expenses", type=int, default=100, help="expenses added by each process")
+    parser.add_argument("--write-behind", action="store_true", help="workers save in the background")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            entries, elapsed, version = runStress(directory, args.processes, args.expenses, args.write_behind)
+        except AssertionError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    print(f"✅ {args.processes} processes added {entries} expenses in {elapsed:.2f}s with nothing lost "
+          f"(file version {version}).")
+
+
+if __name__ == "__main__":
+    main()
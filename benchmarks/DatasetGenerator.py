@@ -0,0 +1,79 @@
+"""
+Writes synthetic NewfinanceData.json-format files for benchmarking.
+
+Every generated user has the password BENCHMARK_PASSWORD, hashed once at a pinned bcrypt cost so
+generation stays fast and logins cost the same on every run.
+
+Run from the repository root:
+    python -m benchmarks.DatasetGenerator out.json --users 1000 --transactions 500
+"""
+import argparse
+import json
+import random
+import time
+
+import bcrypt
+
+
+BENCHMARK_PASSWORD = "benchmark123"
+BENCHMARK_ROUNDS = 4
+CATEGORIES = ["rent", "groceries", "car", "fuel", "utilities", "dining", "travel", "health", "gifts", "misc"]
+SOURCES = ["salary", "freelance", "interest", "dividends", "refund"]
+HISTORY_SECONDS = 2 * 365 * 24 * 3600
+
+
+def userEmail(index):
+    return f"user{index}@example.com"
+
+
+def userName(index):
+    return f"user{index}"
+
+
+def generateUser(index, transactionsPerUser, passwordHash, rng, now):
+    def date():
+        return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now - rng.random() * HISTORY_SECONDS))
+
+    incomeCount = transactionsPerUser // 5
+    return {
+        'username': userName(index),
+        'email': userEmail(index),
+        'password': passwordHash,
+        'name': f"Benchmark User {index}",
+        'age': str(rng.randint(18, 100)),
+        'expenses': [{'category': rng.choice(CATEGORIES), 'amount': round(rng.uniform(1, 500), 2), 'date': date()}
+                     for _ in range(transactionsPerUser - incomeCount)],
+        'income': [{'source': rng.choice(SOURCES), 'amount': round(rng.uniform(100, 5000), 2), 'date': date()}
+                   for _ in range(incomeCount)],
+        'budget': rng.choice([0, 500, 1000, 2000, 5000]),
+    }
+
+
+def generateDataset(fileName, userCount, transactionsPerUser, seed=42, rounds=BENCHMARK_ROUNDS):
+    """Streams a dataset to fileName one user at a time, so large tiers never sit in memory whole."""
+    rng = random.Random(seed)
+    now = time.time()
+    passwordHash = bcrypt.hashpw(BENCHMARK_PASSWORD.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+    with open(fileName, 'w') as file:
+        file.write('{"users": {')
+        for index in range(userCount):
+            if index:
+                file.write(', ')
+            file.write(json.dumps(userEmail(index)) + ': ')
+            file.write(json.dumps(generateUser(index, transactionsPerUser, passwordHash, rng, now)))
+        file.write('}, "currentUser": null}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic finance data file")
+    parser.add_argument("fileName")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--transactions", type=int, default=100, help="transactions per user")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generateDataset(args.fileName, args.users, args.transactions, args.seed)
+    print(f"✅ Wrote {args.users} users x {args.transactions} transactions to {args.fileName}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compares the memory used by transactions stored as a list of dicts (the JSON layout) with the
+columnar TransactionColumns layout.
+
+Run from the repository root:  python -m benchmarks.MemoryBenchmark [entryCount]
+"""
+import gc
+import random
+import sys
+import tracemalloc
+
+from TransactionStore import StringTable, TransactionColumns
+
+
+CATEGORIES = ["rent", "groceries", "car", "fuel", "utilities", "dining", "travel", "health", "gifts", "misc"]
+
+
+def generateEntries(count, seed=1234):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng.choice(CATEGORIES), round(rng.uniform(1, 500), 2)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def buildDictLayout(count):
+    return [{'category': category, 'amount': amount} for category, amount in generateEntries(count)]
+
+
+def buildColumnarLayout(count):
+    columns = TransactionColumns('category', StringTable())
+    for category, amount in generateEntries(count):
+        columns.add(category, amount)
+    return columns
+
+
+def main(count=1_000_000):
+    dictEntries, dictBytes = measure(lambda: buildDictLayout(count))
+    del dictEntries
+    columns, columnBytes = measure(lambda: buildColumnarLayout(count))
+    del columns
+
+    print(f"Entries:          {count:,}")
+    print(f"List of dicts:    {dictBytes / 2**20:8.1f} MiB ({dictBytes / count:6.1f} bytes/entry)")
+    print(f"Columnar arrays:  {columnBytes / 2**20:8.1f} MiB ({columnBytes / count:6.1f} bytes/entry)")
+    print(f"Reduction:        {dictBytes / columnBytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
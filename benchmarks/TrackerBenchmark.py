@@ -0,0 +1,143 @@
+"""
+Times FinanceTracker operations across dataset size tiers and prints the results as JSON.
+
+Each tier is a fresh generated dataset. bcrypt is pinned to BENCHMARK_ROUNDS for both the stored
+hashes and the tracker's PasswordHasher, so numbers are comparable between runs and machines.
+
+Run from the repository root:
+    python -m benchmarks.TrackerBenchmark --tiers 100x100,1000x100 --repeat 20 --output results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from FinanceTracker import FinanceTracker
+from PasswordHasher import PasswordHasher
+from BinarySnapshot import convertSnapshot
+from benchmarks.DatasetGenerator import BENCHMARK_PASSWORD, BENCHMARK_ROUNDS, generateDataset, userEmail, userName
+
+
+MODES = {
+    'default': {},
+    'journaled': {'journaled': True},
+    'writeBehind': {'writeBehind': True},
+    'binary': {'snapshotFormat': 'binary'},
+    'binaryZlib': {'snapshotFormat': 'binary+zlib'},
+}
+
+
+def percentile(sortedSamples, fraction):
+    index = min(len(sortedSamples) - 1, int(round(fraction * (len(sortedSamples) - 1))))
+    return sortedSamples[index]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds."""
+    ordered = sorted(sample * 1000 for sample in samples)
+    return {
+        "runs": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1],
+    }
+
+
+def timeCalls(function, repeat):
+    samples = []
+    for iteration in range(repeat):
+        start = time.perf_counter()
+        function(iteration)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def benchmarkTier(directory, userCount, transactionsPerUser, repeat, mode, seed):
+    fileName = os.path.join(directory, f"tier_{userCount}x{transactionsPerUser}.json")
+    generateDataset(fileName, userCount, transactionsPerUser, seed)
+    options = dict(MODES[mode], passwordHasher=PasswordHasher(rounds=BENCHMARK_ROUNDS))
+    if 'snapshotFormat' in options:
+        # Cold load should read the format under test, not the generated JSON
+        convertSnapshot(fileName, fileName, options['snapshotFormat'])
+
+    def openTracker():
+        return FinanceTracker(fileName, **options)
+
+    results = {"fileBytes": os.path.getsize(fileName)}
+    loadSamples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tracker = openTracker()
+        loadSamples.append(time.perf_counter() - start)
+        tracker.close()  # Outside the timed region: may checkpoint or stop the flusher thread
+    results["coldLoad"] = summarize(loadSamples)
+
+    tracker = openTracker()
+    results["register"] = summarize(timeCalls(
+        lambda i: tracker.register(f"new{i}@example.com", BENCHMARK_PASSWORD, "New User", 30, f"new{i}"), repeat))
+    results["loginByEmail"] = summarize(timeCalls(
+        lambda i: tracker.login(userEmail(i % userCount), BENCHMARK_PASSWORD), repeat))
+    results["loginByUsername"] = summarize(timeCalls(
+        lambda i: tracker.login(userName(i % userCount), BENCHMARK_PASSWORD), repeat))
+    tracker.login(userEmail(0), BENCHMARK_PASSWORD)
+    results["addExpense"] = summarize(timeCalls(lambda i: tracker.addExpense("benchmark", 1.0 + i), repeat))
+    results["viewReport"] = summarize(timeCalls(lambda i: tracker.viewReport(), repeat))
+    tracker.close()
+    return results
+
+
+def parseTiers(text):
+    tiers = []
+    for tier in text.split(','):
+        users, transactions = tier.lower().split('x')
+        tiers.append((int(users), int(transactions)))
+    return tiers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FinanceTracker operations")
+    parser.add_argument("--tiers", default="100x100,1000x100,1000x1000",
+                        help="comma-separated USERSxTRANSACTIONS tiers (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per operation")
+    parser.add_argument("--mode", choices=sorted(MODES), default='default', help="storage mode to benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "bcryptRounds": BENCHMARK_ROUNDS,
+        "mode": args.mode,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "unit": "ms",
+        "tiers": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for userCount, transactionsPerUser in parseTiers(args.tiers):
+            # The tracker prints status messages; keep them out of the JSON output
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = benchmarkTier(directory, userCount, transactionsPerUser, args.repeat, args.mode, args.seed)
+            report["tiers"][f"{userCount}x{transactionsPerUser}"] = results
+            print(f"Finished tier {userCount}x{transactionsPerUser}", file=sys.stderr)
+
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,27 @@
 import json
 import os
-import time
+import threading
 from datetime import datetime
 import bcrypt  # For password hashing
+from BackgroundFlusher import BackgroundFlusher
+from RateLimiter import RateLimiter
+from Utilities import FileUtils
 
 
 class FinanceTracker:
-    def __init__(self, fileName='finance_data.json'):
+    def __init__(self, fileName='finance_data.json', writeBehind=False, flushIntervalMs=500, maxPendingChanges=100):
         self.fileName = fileName
-        self.data = {"users": {}, "currentUser": None, "failedAttempts": {}}  # Default structure
-        self.cooldownTime = 60  # Cooldown period in seconds after 3 failed attempts
+        self.lock = threading.RLock()  # Stops the background flusher from serializing self.data mid-change
+        self.data = {"users": {}, "currentUser": None}  # Default structure
+        self.cooldownTime = 60  # Seconds a locked-out identifier waits before it may try again
         self.maxAttempts = 3  # Maximum allowed failed login attempts
+        # Failed attempts are counted in memory only, so a burst of bad logins never rewrites the file.
+        # One attempt is earned back every cooldownTime seconds, as with the old lockout
+        self.rateLimiter = RateLimiter(identifierCapacity=self.maxAttempts,
+                                       identifierWindow=self.cooldownTime * self.maxAttempts)
         self.loadData()
+        # Write-behind: changes are saved by a background thread
+        self.flusher = BackgroundFlusher(self.saveData, flushIntervalMs, maxPendingChanges) if writeBehind else None
 
     def loadData(self):
         try:
@@ -19,28 +29,42 @@ class FinanceTracker:
                 self.data = json.load(file)
         except FileNotFoundError:
             print("⚠️  Data file not found. Initializing a new data file...")
-            self.data = {"users": {}, "currentUser": None, "failedAttempts": {}}
+            self.data = {"users": {}, "currentUser": None}
             self.saveData()
         except json.JSONDecodeError:
             print("⚠️  The data file appears to be corrupted. A new file will be initialized.")
             backupFileName = f"{self.fileName}.{datetime.now().strftime('%Y%m%d%H%M%S')}.bak"
             os.rename(self.fileName, backupFileName)
             print(f"⚠️ Corrupted file backed up as {backupFileName}.")
-            self.data = {"users": {}, "currentUser": None, "failedAttempts": {}}
+            self.data = {"users": {}, "currentUser": None}
             self.saveData()
         except Exception as e:
             print(f"❌ An unexpected error occurred: {e}")
-            self.data = {"users": {}, "currentUser": None, "failedAttempts": {}}
+            self.data = {"users": {}, "currentUser": None}
+
+        # Older files persisted failed login bookkeeping; it is dropped on the next save
+        self.data.pop('failedAttempts', None)
 
     def saveData(self):
         try:
-            with open(self.fileName, 'w') as file:
-                json.dump(self.data, file, indent=4)
+            with self.lock:
+                text = json.dumps(self.data, indent=4)
+            FileUtils.writeAtomically(self.fileName, text)
         except PermissionError:
             print("❌ Permission denied. Unable to save data.")
         except Exception as e:
             print(f"❌ An unexpected error occurred while saving data: {e}")
 
+    def persist(self):
+        if self.flusher is not None:
+            self.flusher.markDirty()
+        else:
+            self.saveData()
+
+    def close(self):
+        if self.flusher is not None:
+            self.flusher.close()
+
     def hashPassword(self, password):
         return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
@@ -60,23 +84,23 @@ class FinanceTracker:
             return "❌ Username already exists."
 
         # Add the user to the database
-        self.data['users'][email] = {
-            'password': self.hashPassword(password),
-            'username': username,
-            'expenses': [],
-            'income': [],
-            'budget': 0
-        }
-        self.saveData()
+        hashedPassword = self.hashPassword(password)
+        with self.lock:
+            self.data['users'][email] = {
+                'password': hashedPassword,
+                'username': username,
+                'expenses': [],
+                'income': [],
+                'budget': 0
+            }
+        self.persist()
         return "✅ Registration successful."
 
     def login(self, identifier, password):
         # Check cooldown period for failed attempts
-        currentTime = time.time()
-        if identifier in self.data['failedAttempts']:
-            failedData = self.data['failedAttempts'][identifier]
-            if failedData['count'] >= self.maxAttempts and currentTime - failedData['time'] < self.cooldownTime:
-                return f"❌ Too many failed attempts. Please try again in {self.cooldownTime - (currentTime - failedData['time']):.0f} seconds."
+        wait = self.rateLimiter.retryAfter(identifier)
+        if wait:
+            return RateLimiter.tooManyAttemptsMessage(wait)
 
         # Find user by email or username
         user = None
@@ -86,22 +110,20 @@ class FinanceTracker:
                 break
 
         if user and self.checkPassword(password, user['password']):
-            self.data['currentUser'] = user['username']
-            self.data['failedAttempts'].pop(identifier, None)  # Reset failed attempts on successful login
-            self.saveData()
+            with self.lock:
+                self.data['currentUser'] = user['username']
+            self.rateLimiter.recordSuccess(identifier)  # Reset failed attempts on successful login
+            self.persist()
             return "✅ Login successful."
 
         # Handle failed login attempt
-        if identifier not in self.data['failedAttempts']:
-            self.data['failedAttempts'][identifier] = {'count': 0, 'time': currentTime}
-        self.data['failedAttempts'][identifier]['count'] += 1
-        self.data['failedAttempts'][identifier]['time'] = currentTime
-        self.saveData()
+        self.rateLimiter.recordFailure(identifier)
         return "❌ Invalid credentials. Try again."
 
     def logout(self):
-        self.data['currentUser'] = None
-        self.saveData()
+        with self.lock:
+            self.data['currentUser'] = None
+        self.persist()
         return "✅ Logged out successfully."
 
     def checkLogin(self):